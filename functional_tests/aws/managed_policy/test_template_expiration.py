@@ -41,7 +41,7 @@ class ManagedPolicyExpirationTestCase(IsolatedAsyncioTestCase):
             "Expired Statement was not added to the template.",
         )
 
-        await remove_expired_resources(
+        remove_expired_resources(
             self.template, self.template.resource_type, self.template.resource_id
         )
         self.template.write()
@@ -58,7 +58,7 @@ class ManagedPolicyExpirationTestCase(IsolatedAsyncioTestCase):
         self.template.write()
 
         self.assertFalse(self.template.deleted)
-        await remove_expired_resources(
+        remove_expired_resources(
             self.template, self.template.resource_type, self.template.resource_id
         )
         self.assertTrue(self.template.deleted)
@@ -39,9 +39,7 @@ class ExpirationPolicyTestCase(IsolatedAsyncioTestCase):
         template.write()
 
         self.assertFalse(template.deleted)
-        await remove_expired_resources(
-            template, template.resource_type, template.resource_id
-        )
+        remove_expired_resources(template, template.resource_type, template.resource_id)
         self.assertTrue(template.deleted)
 
     async def test_delete_policy(self):
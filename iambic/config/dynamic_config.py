@@ -228,9 +228,11 @@ class Config(ConfigMixin, BaseTemplate):
                 for plugin in self.configured_plugins
                 if plugin.config_name == exe_message.provider_type
             ][0]
-            await plugin.async_import_callable(
-                exe_message, self.get_config_plugin(plugin), output_dir
-            )
+            tasks = [
+                plugin.async_import_callable(
+                    exe_message, self.get_config_plugin(plugin), output_dir
+                )
+            ]
         else:
             tasks = []
             for plugin in self.configured_plugins:
@@ -242,7 +244,10 @@ class Config(ConfigMixin, BaseTemplate):
                     )
                 )
 
+        try:
             await asyncio.gather(*tasks)
+        finally:
+            await self.teardown_plugins()
 
     async def run_apply(
         self, exe_message: ExecutionMessage, templates: list[BaseTemplate]
@@ -287,7 +292,10 @@ class Config(ConfigMixin, BaseTemplate):
                     )
 
         # Retrieve template changes across plugins and flatten responses
-        template_changes = await asyncio.gather(*tasks)
+        try:
+            template_changes = await asyncio.gather(*tasks)
+        finally:
+            await self.teardown_plugins()
         template_changes = list(itertools.chain.from_iterable(template_changes))
 
         if ctx.execute and template_changes:
@@ -337,6 +345,18 @@ class Config(ConfigMixin, BaseTemplate):
         log.info("Finished scanning for upstream changes to config attributes.")
         self.write()
 
+    async def teardown_plugins(self):
+        """
+        Called to release plugin resources that are created at run-time.
+        """
+        await asyncio.gather(
+            *[
+                plugin.async_teardown_callable(self.get_config_plugin(plugin))
+                for plugin in self.configured_plugins
+                if plugin.async_teardown_callable
+            ]
+        )
+
     async def configure_plugins(self):
         """
         Called to set plugin metadata that is generated at run-time.
@@ -56,8 +56,16 @@ async def clone_git_repos(config, repo_dir: str) -> dict[str, Repo]:
     return repos
 
 
-def clone_git_repo(repo_url: str, repo_path: str, remote_branch_name: str):
-    repo = Repo.clone_from(repo_url, repo_path, branch=remote_branch_name)
+def clone_git_repo(
+    repo_url: str, repo_path: str, remote_branch_name: str, depth: int = None
+):
+    clone_kwargs = {}
+    if depth:
+        # A shallow clone skips downloading the full history
+        clone_kwargs = {"depth": depth, "single_branch": True}
+    repo = Repo.clone_from(
+        repo_url, repo_path, branch=remote_branch_name, **clone_kwargs
+    )
     return repo
 
 
@@ -94,6 +94,12 @@ class ProviderPlugin(PydanticBaseModel):
         "This function must accept the params: (exe_message: ExecutionMessage, config: ProviderConfig, repo_dir: str, remote_worker: Worker = None)",
         hidden_from_schema=True,
     )
+    async_teardown_callable: Optional[Any] = Field(
+        description="(OPTIONAL) The function that is called once the provider's work is done."
+        "It is used to release run-time resources like pooled connections."
+        "This function must accept the param (config: ProviderConfig).",
+        hidden_from_schema=True,
+    )
     templates: list[Type[BaseTemplate]] = Field(
         description="The list of templates used for this provider."
     )
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import contextvars
+import functools
 import os
 import pathlib
 import re
 import sys
 import tempfile
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timezone
 from io import StringIO
 from pathlib import Path
@@ -17,6 +20,9 @@ from urllib.parse import unquote_plus
 import aiofiles
 import jwt
 from asgiref.sync import sync_to_async
+from deepdiff import DeepDiff
+from deepdiff.model import PrettyOrderedSet
+from pydantic import BaseModel as PydanticBaseModel
 from ruamel.yaml import YAML
 
 from iambic.core import noq_json as json
@@ -30,6 +36,8 @@ if TYPE_CHECKING:
 
 
 NOQ_TEMPLATE_REGEX = r".*template_type:\n?.*NOQ::"
+CAMEL_CASE_BOUNDARY_REGEX = re.compile("([a-z0-9])([A-Z])")
+SNAKE_CASE_BOUNDARY_REGEX = re.compile(r"_([a-z])")
 RATE_LIMIT_STORAGE: dict[str, int] = {}
 IAMBIC_ERR_MSG = (
     "Please file a github issue or message us on the slack community channel. "
@@ -66,16 +74,19 @@ def get_writable_directory() -> pathlib.Path:
     return __WRITABLE_DIRECTORY__
 
 
+# normalize_dict_keys runs every key of every boto3 response through these,
+# and the same handful of keys repeat across all records, so cache the results
+@functools.lru_cache(maxsize=4096)
 def camel_to_snake(str_obj: str) -> str:
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", str_obj).lower()
+    return CAMEL_CASE_BOUNDARY_REGEX.sub(r"\1_\2", str_obj).lower()
 
 
 def camel_to_kebab(str_obj: str) -> str:
-    return re.sub("([a-z0-9])([A-Z])", r"\1-\2", str_obj).lower()
+    return CAMEL_CASE_BOUNDARY_REGEX.sub(r"\1-\2", str_obj).lower()
 
 
 def snake_to_camelback(str_obj: str) -> str:
-    return re.sub(r"_([a-z])", lambda x: x.group(1).upper(), str_obj)
+    return SNAKE_CASE_BOUNDARY_REGEX.sub(lambda x: x.group(1).upper(), str_obj)
 
 
 def snake_to_camelcap(str_obj: str) -> str:
@@ -171,9 +182,21 @@ async def gather_templates(repo_dir: str, template_type: str = None) -> list[str
     return [fp for fp in file_paths if fp]
 
 
+# Shared by every aio_wrapper call that doesn't need to run on a specific thread
+SYNC_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="iambic-sync")
+
+
 async def aio_wrapper(fnc, *args, **kwargs):
-    thread_sensitive = kwargs.pop("thread_sensitive", False)
-    return await sync_to_async(fnc, thread_sensitive=thread_sensitive)(*args, **kwargs)
+    if kwargs.pop("thread_sensitive", False):
+        return await sync_to_async(fnc, thread_sensitive=True)(*args, **kwargs)
+    elif asyncio.iscoroutinefunction(fnc):
+        raise TypeError("aio_wrapper can only be applied to sync functions.")
+
+    # Skips the per call overhead of sync_to_async while still propagating context vars
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        SYNC_EXECUTOR, functools.partial(context.run, fnc, *args, **kwargs)
+    )
 
 
 class NoqYaml(YAML):
@@ -204,6 +227,7 @@ class NoqSemaphore:
             hello_there_semaphore = NoqSemaphore(hello_there, 3)
             asyncio.run(hello_there_semaphore.process([{} for _ in range(10)]))
         """
+        self.batch_size = batch_size
         self.limit = asyncio.Semaphore(batch_size)
         self.callback_function = callback_function
         self.callback_is_async = callback_is_async
@@ -216,10 +240,26 @@ class NoqSemaphore:
             return await aio_wrapper(self.callback_function, **kwargs)
 
     async def process(self, messages: list[dict], return_exceptions=False):
-        return await asyncio.gather(
-            *[asyncio.create_task(self.handle_message(**msg)) for msg in messages],
-            return_exceptions=return_exceptions,
+        # A fixed pool of workers pulls the messages so at most batch_size
+        # coroutines exist per call, instead of a task per message up front.
+        # The semaphore is still what bounds concurrency across every
+        # process call sharing this instance.
+        results = [None] * len(messages)
+        pending_messages = iter(enumerate(messages))
+
+        async def worker():
+            for idx, msg in pending_messages:
+                try:
+                    results[idx] = await self.handle_message(**msg)
+                except Exception as err:
+                    if not return_exceptions:
+                        raise
+                    results[idx] = err
+
+        await asyncio.gather(
+            *[worker() for _ in range(min(self.batch_size, len(messages)))]
         )
+        return results
 
 
 async def async_batch_processor(
@@ -298,6 +338,25 @@ def un_wrap_json_and_dump_values(json_obj: Any) -> Any:
     return json_obj
 
 
+def _json_safe_diff_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _json_safe_diff_value(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple, set, frozenset, PrettyOrderedSet)):
+        return [_json_safe_diff_value(v) for v in value]
+    elif isinstance(value, type):
+        return value.__name__
+    return value
+
+
+def deep_diff_to_dict(diff: DeepDiff) -> dict:
+    """Convert a DeepDiff result to a json safe dict.
+
+    Equivalent to json.loads(diff.to_json()) without the serialization round trip.
+    Type changes are reported as type names and sets as lists.
+    """
+    return _json_safe_diff_value(diff.to_dict())
+
+
 # lifted from cloudumi's repo common.lib.generic import sort_dict, and modified to support prioritization
 def sort_dict(original, prioritize=None):
     """Recursively sorts dictionary keys and dictionary values in alphabetical order,
@@ -479,24 +538,52 @@ def evaluate_on_provider(
     if not isinstance(resource, AccessModelMixin):
         return True
 
-    if provider_details.parent_id:
-        if provider_details.parent_id in resource.excluded_parents:
+    # Templates are expanded for every resource x provider pair and the rules
+    # on a resource repeat across providers, so the result is memoized on the
+    # rule and provider values. Keying on values rather than the objects keeps
+    # it correct when the rules of a resource are changed in place.
+    evaluate_args = (
+        tuple(resource.included_parents),
+        tuple(resource.excluded_parents),
+        tuple(resource.included_children),
+        tuple(resource.excluded_children),
+        provider_details.parent_id,
+        tuple(provider_details.all_identifiers),
+    )
+    try:
+        return _evaluate_access_rules(*evaluate_args)
+    except TypeError:
+        # A rule that isn't hashable can't be memoized
+        return _evaluate_access_rules.__wrapped__(*evaluate_args)
+
+
+@functools.lru_cache(maxsize=8192)
+def _evaluate_access_rules(
+    included_parents: tuple,
+    excluded_parents: tuple,
+    included_children: tuple,
+    excluded_children: tuple,
+    parent_id: Optional[str],
+    all_identifiers: tuple,
+) -> bool:
+    if parent_id:
+        if parent_id in excluded_parents:
             return False
-        elif "*" not in resource.included_parents and not any(
-            re.match(parent_id, provider_details.parent_id)
-            for parent_id in resource.included_parents
+        elif "*" not in included_parents and not any(
+            re.match(included_parent_id, parent_id)
+            for included_parent_id in included_parents
         ):
             return False
 
-    if not resource.included_children:
+    if not included_children:
         return True
 
-    provider_ids = sorted(provider_details.all_identifiers, key=len, reverse=True)
+    provider_ids = sorted(all_identifiers, key=len, reverse=True)
     included_children = sorted(
-        [rule.lower() for rule in resource.included_children], key=len, reverse=True
+        [rule.lower() for rule in included_children], key=len, reverse=True
     )
     excluded_children = sorted(
-        [rule.lower() for rule in resource.excluded_children], key=len, reverse=True
+        [rule.lower() for rule in excluded_children], key=len, reverse=True
     )
     exclude_weight = 0
 
@@ -523,6 +610,16 @@ def apply_to_provider(resource, provider_details) -> bool:
     return evaluate_on_provider(resource, provider_details)
 
 
+@functools.lru_cache(maxsize=1024)
+def compile_rule_regex(regex: str) -> Optional[re.Pattern]:
+    # The same handful of account and provider rules are matched against
+    # every template, so only compile each once. None if it isn't a regex.
+    try:
+        return re.compile(regex)
+    except re.error:
+        return None
+
+
 def is_regex_match(regex, test_string):
     regex = regex.lower()
     test_string = test_string.lower()
@@ -530,11 +627,10 @@ def is_regex_match(regex, test_string):
     if "*" in regex:
         # Normalize user created regex to python regex
         # Example, dev-* to dev-.* to prevent re.match return True for eval on dev
-        try:
-            sanitized_regex = regex.replace(".*", "*").replace("*", ".*")
-            return bool(re.match(sanitized_regex, test_string))
-        except re.error:
-            return regex == test_string
+        sanitized_regex = regex.replace(".*", "*").replace("*", ".*")
+        if pattern := compile_rule_regex(sanitized_regex):
+            return bool(pattern.match(test_string))
+        return regex == test_string
     else:
         # it is not an actual regex string, just string comparison
         return regex == test_string
@@ -698,35 +794,38 @@ def simplify_dt(_dt: Union[datetime, date]) -> str:
     return dt_str
 
 
-def normalize_dict_keys(
-    obj, case_convention=camel_to_snake, skip_formatting_keys: list = None
-):
-    if not skip_formatting_keys:
-        skip_formatting_keys = ["condition"]
+def _normalize_dict_keys(obj, case_convention, skip_formatting_keys: frozenset):
     if isinstance(obj, dict):
         new_obj = dict()
         for k, v in obj.items():
             k = case_convention(k)
-            if isinstance(v, list):
-                new_obj[k] = [
-                    normalize_dict_keys(x, case_convention, skip_formatting_keys)
-                    for x in v
-                ]
-            else:
-                new_obj[k] = (
-                    normalize_dict_keys(v, case_convention, skip_formatting_keys)
-                    if k not in skip_formatting_keys
-                    else v
-                )
+            # Leaves are returned as is without another call, and lists are
+            # normalized even when they sit under a skipped key
+            if isinstance(v, list) or (
+                isinstance(v, dict) and k not in skip_formatting_keys
+            ):
+                v = _normalize_dict_keys(v, case_convention, skip_formatting_keys)
+            new_obj[k] = v
         return new_obj
     elif isinstance(obj, list):
         return [
-            normalize_dict_keys(x, case_convention, skip_formatting_keys) for x in obj
+            _normalize_dict_keys(x, case_convention, skip_formatting_keys)
+            if isinstance(x, (dict, list))
+            else x
+            for x in obj
         ]
     else:
         return obj
 
 
+def normalize_dict_keys(
+    obj, case_convention=camel_to_snake, skip_formatting_keys: list = None
+):
+    if not skip_formatting_keys:
+        skip_formatting_keys = ["condition"]
+    return _normalize_dict_keys(obj, case_convention, frozenset(skip_formatting_keys))
+
+
 def exceptions_in_proposed_changes(obj) -> bool:
     if isinstance(obj, dict):
         if obj.get("exceptions_seen"):
@@ -743,12 +842,29 @@ def exceptions_in_proposed_changes(obj) -> bool:
         return any(exceptions_in_proposed_changes(x) for x in obj)
 
 
-async def remove_expired_resources(
+@functools.lru_cache(maxsize=None)
+def _model_field_names_to_walk(model_cls) -> tuple[str, ...]:
+    # Only fields that can hold a model can hold an expiring resource.
+    # Fields typed as str, int, dict etc. are skipped without being visited.
+    # Unions, Any, forward refs and bare lists can't be ruled out so are walked.
+    # Any is checked by identity as it passes the isinstance check on Python 3.11+.
+    return tuple(
+        field_name
+        for field_name, field in model_cls.__fields__.items()
+        if field.type_ is Any
+        or not isinstance(field.type_, type)
+        or issubclass(field.type_, (PydanticBaseModel, list))
+    )
+
+
+def remove_expired_resources(
     resource,
     template_resource_type: str,
     template_resource_id: str,
     delete_resource_if_expired: bool = True,
 ):
+    # The walk does no I/O, so it is a plain function rather than a coroutine
+    # that would schedule a task for every nested field.
     from iambic.core.models import BaseModel
 
     if not isinstance(resource, BaseModel):
@@ -773,30 +889,34 @@ async def remove_expired_resources(
                 resource.deleted = True
                 return resource
 
-    for field_name in resource.__fields__.keys():
+    for field_name in _model_field_names_to_walk(type(resource)):
         field_val = getattr(resource, field_name)
         if isinstance(field_val, list):
-            new_value = await asyncio.gather(
-                *[
-                    remove_expired_resources(
-                        elem, template_resource_type, template_resource_id
-                    )
-                    for elem in field_val
-                ]
-            )
-            setattr(resource, field_name, new_value)
-            if delete_resource_if_expired:
-                for elem in new_value:
-                    if getattr(elem, "deleted", None) is True:
-                        new_value.remove(elem)
-                        setattr(resource, field_name, new_value)
+            new_value = [
+                remove_expired_resources(
+                    elem, template_resource_type, template_resource_id
+                )
+                for elem in field_val
+            ]
+            if delete_resource_if_expired and any(
+                getattr(elem, "deleted", None) is True for elem in new_value
+            ):
+                setattr(
+                    resource,
+                    field_name,
+                    [
+                        elem
+                        for elem in new_value
+                        if getattr(elem, "deleted", None) is not True
+                    ],
+                )
         else:
-            new_value = await remove_expired_resources(
+            new_value = remove_expired_resources(
                 field_val, template_resource_type, template_resource_id
             )
             if getattr(new_value, "deleted", None) is True:
                 setattr(resource, field_name, None)
-            else:
+            elif new_value is not field_val:
                 setattr(resource, field_name, new_value)
 
     return resource
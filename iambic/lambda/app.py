@@ -6,10 +6,10 @@ import sys
 import tempfile
 import time
 from enum import Enum
+from typing import Callable
 
 from iambic.config.dynamic_config import load_config
 from iambic.config.utils import resolve_config_template_path
-from iambic.core.models import BaseModel
 from iambic.main import run_clone_repos, run_detect, run_git_apply, run_git_plan
 
 REPO_BASE_PATH = os.path.expanduser("~/.iambic/repos/")
@@ -58,8 +58,9 @@ class LambdaCommand(Enum):
     run_clone_git_repos = "clone_git_repos"
 
 
-class LambdaContext(BaseModel):
-    command: str
+async def _run_import(repo_dir: str):
+    config = await load_config(await resolve_config_template_path(repo_dir))
+    return await config.run_import(repo_dir)
 
 
 def handler(event, context):
@@ -73,38 +74,51 @@ def run_handler(event=None, context=None):
     """
     if not context:
         context = {"command": "import"}
-    lambda_context = LambdaContext(**context)
-
-    if lambda_context.command == LambdaCommand.run_import.value:
-        config_path = asyncio.run(resolve_config_template_path(REPO_BASE_PATH))
-        config = asyncio.run(load_config(config_path))
-        return asyncio.run(config.run_import(REPO_BASE_PATH))
-    elif lambda_context.command == LambdaCommand.run_detect.value:
-        return run_detect(REPO_BASE_PATH)
-    elif lambda_context.command == LambdaCommand.run_apply.value:
-        return run_git_apply(
-            False,
-            FROM_SHA,
-            TO_SHA,
-            repo_dir=REPO_BASE_PATH,
-            output_path=PLAN_OUTPUT_PATH,
-        )
-    elif lambda_context.command == LambdaCommand.run_plan.value:
-        return run_git_plan(PLAN_OUTPUT_PATH, repo_dir=REPO_BASE_PATH)
-    elif lambda_context.command == LambdaCommand.run_git_apply.value:
-        return run_git_apply(
-            False,
-            FROM_SHA,
-            TO_SHA,
-            repo_dir=REPO_BASE_PATH,
-            output_path=PLAN_OUTPUT_PATH,
-        )
-    elif lambda_context.command == LambdaCommand.run_git_plan.value:
-        return run_git_plan(PLAN_OUTPUT_PATH, repo_dir=REPO_BASE_PATH)
-    elif lambda_context.command == LambdaCommand.run_clone_git_repos.value:
-        return run_clone_repos(REPO_BASE_PATH)
-    else:
-        raise NotImplementedError(f"Unknown command {lambda_context.command}")
+    # The dispatch lookup is the only validation the command needs
+    command = context["command"]
+    command_handler = LAMBDA_COMMAND_DISPATCH_MAP.get(command)
+    if command_handler is None:
+        raise NotImplementedError(f"Unknown command {command}")
+    return command_handler()
+
+
+def _handle_import():
+    return asyncio.run(_run_import(REPO_BASE_PATH))
+
+
+def _handle_detect():
+    return run_detect(REPO_BASE_PATH)
+
+
+def _handle_git_apply():
+    return run_git_apply(
+        False,
+        FROM_SHA,
+        TO_SHA,
+        repo_dir=REPO_BASE_PATH,
+        output_path=PLAN_OUTPUT_PATH,
+    )
+
+
+def _handle_git_plan():
+    return run_git_plan(PLAN_OUTPUT_PATH, repo_dir=REPO_BASE_PATH)
+
+
+def _handle_clone_git_repos():
+    return run_clone_repos(REPO_BASE_PATH)
+
+
+# The handlers read the module level paths when called,
+# so they pick up the values set by the init functions.
+LAMBDA_COMMAND_DISPATCH_MAP: dict[str, Callable] = {
+    LambdaCommand.run_import.value: _handle_import,
+    LambdaCommand.run_detect.value: _handle_detect,
+    LambdaCommand.run_apply.value: _handle_git_apply,
+    LambdaCommand.run_plan.value: _handle_git_plan,
+    LambdaCommand.run_git_apply.value: _handle_git_apply,
+    LambdaCommand.run_git_plan.value: _handle_git_plan,
+    LambdaCommand.run_clone_git_repos.value: _handle_clone_git_repos,
+}
 
 
 if __name__ == "__main__":
@@ -10,7 +10,7 @@ from deepdiff import DeepDiff
 from iambic.core.context import ctx
 from iambic.core.logger import log
 from iambic.core.models import ProposedChange, ProposedChangeType
-from iambic.core.utils import aio_wrapper, plugin_apply_wrapper
+from iambic.core.utils import aio_wrapper, deep_diff_to_dict, plugin_apply_wrapper
 from iambic.plugins.v0_1_0.aws.utils import boto_crud_call, paginated_search
 
 if TYPE_CHECKING:
@@ -255,7 +255,7 @@ async def apply_group_inline_policies(
             # DeepDiff will return type changes as actual type functions and not strings,
             # and this will cause json serialization to fail later on when we process
             # the proposed changes. We force type changes to strings here.
-            policy_drift = json.loads(policy_drift.to_json())
+            policy_drift = deep_diff_to_dict(policy_drift)
 
         if not existing_policy_doc or policy_drift:
             if policy_drift:
@@ -382,6 +382,8 @@ class AwsIamManagedPolicyTemplate(AWSTemplate, AccessModel):
                     json.loads(account_policy["PolicyDocument"]),
                     current_policy["PolicyDocument"],
                     log_params,
+                    # Already serialized, no need to dump it again on update
+                    template_policy_document_json=account_policy["PolicyDocument"],
                 ),
                 apply_managed_policy_tags(
                     client,
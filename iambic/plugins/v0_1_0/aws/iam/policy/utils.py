@@ -10,7 +10,12 @@ from iambic.core import noq_json as json
 from iambic.core.context import ctx
 from iambic.core.logger import log
 from iambic.core.models import ProposedChange, ProposedChangeType
-from iambic.core.utils import NoqSemaphore, aio_wrapper, plugin_apply_wrapper
+from iambic.core.utils import (
+    NoqSemaphore,
+    aio_wrapper,
+    deep_diff_to_dict,
+    plugin_apply_wrapper,
+)
 from iambic.plugins.v0_1_0.aws.models import AWSAccount
 from iambic.plugins.v0_1_0.aws.utils import boto_crud_call, paginated_search
 
@@ -62,15 +67,34 @@ async def get_managed_policy_attachments(iam_client, policy_arn: str):
     )
 
 
-async def get_managed_policy(iam_client, policy_arn: str, **kwargs) -> dict:
+async def get_managed_policy(
+    iam_client, policy_arn: str, default_version_id: str = None, **kwargs
+) -> dict:
+    """Get the managed policy along with the document of its default version.
+
+    If the default version id is already known (e.g. from list_policies)
+    the policy and its document are requested concurrently.
+    """
     try:
-        response = (
-            await boto_crud_call(iam_client.get_policy, PolicyArn=policy_arn)
-        ).get("Policy", {})
-        if response:
-            response["PolicyDocument"] = await get_managed_policy_version_doc(
-                iam_client, policy_arn, response.pop("DefaultVersionId")
+        if default_version_id:
+            response, policy_document = await asyncio.gather(
+                boto_crud_call(iam_client.get_policy, PolicyArn=policy_arn),
+                get_managed_policy_version_doc(
+                    iam_client, policy_arn, default_version_id
+                ),
             )
+            response = response.get("Policy", {})
+            if response:
+                response.pop("DefaultVersionId", None)
+                response["PolicyDocument"] = policy_document
+        else:
+            response = (
+                await boto_crud_call(iam_client.get_policy, PolicyArn=policy_arn)
+            ).get("Policy", {})
+            if response:
+                response["PolicyDocument"] = await get_managed_policy_version_doc(
+                    iam_client, policy_arn, response.pop("DefaultVersionId")
+                )
     except ClientError as err:
         if err.response["Error"]["Code"] == "NoSuchEntity":
             response = {}
@@ -100,6 +124,8 @@ async def list_managed_policies(
         Scope=scope,
         OnlyAttached=only_attached,
         PathPrefix=path_prefix,
+        # 1000 is the largest page size list_policies supports, the default is 100
+        MaxItems=1000,
     )
     if policy_usage_filter:
         list_policy_kwargs["PolicyUsageFilter"] = policy_usage_filter
@@ -109,7 +135,11 @@ async def list_managed_policies(
     )
     return await get_managed_policy_semaphore.process(
         [
-            {"iam_client": iam_client, "policy_arn": policy["Arn"]}
+            {
+                "iam_client": iam_client,
+                "policy_arn": policy["Arn"],
+                "default_version_id": policy.get("DefaultVersionId"),
+            }
             for policy in managed_policies
         ]
     )
@@ -118,17 +148,16 @@ async def list_managed_policies(
 async def delete_managed_policy(iam_client, policy_arn: str, log_params: dict):
     policy_attachments = await get_managed_policy_attachments(iam_client, policy_arn)
     policy_versions = await list_managed_policy_versions(iam_client, policy_arn)
-    tasks = []
-
-    for detachment_type in ["User", "Role", "Group"]:
-        for entity in policy_attachments[f"Policy{detachment_type}s"]:
-            tasks.append(
-                boto_crud_call(
-                    getattr(iam_client, f"detach_{detachment_type.lower()}_policy"),
-                    PolicyArn=policy_arn,
-                    **{f"{detachment_type}Name": entity[f"{detachment_type}Name"]},
-                )
-            )
+    detachments = (
+        ("PolicyUsers", "UserName", iam_client.detach_user_policy),
+        ("PolicyRoles", "RoleName", iam_client.detach_role_policy),
+        ("PolicyGroups", "GroupName", iam_client.detach_group_policy),
+    )
+    tasks = [
+        boto_crud_call(detach_fn, PolicyArn=policy_arn, **{name_key: entity[name_key]})
+        for attachment_key, name_key, detach_fn in detachments
+        for entity in policy_attachments[attachment_key]
+    ]
 
     if len(policy_versions) > 1:
         for version in policy_versions:
@@ -152,16 +181,28 @@ async def delete_managed_policy(iam_client, policy_arn: str, log_params: dict):
     await boto_crud_call(iam_client.delete_policy, PolicyArn=policy_arn)
 
 
+def _canonical_policy_document(policy_document) -> str:
+    return json.dumps(policy_document, sort_keys=True)
+
+
 async def apply_update_managed_policy(
     iam_client,
     policy_arn: str,
     template_policy_document: dict,
     existing_policy_document: dict,
     log_params: dict,
+    template_policy_document_json: str = None,
 ) -> list[ProposedChange]:
     response = []
     if isinstance(existing_policy_document, str):
         existing_policy_document = json.loads(existing_policy_document)
+    if _canonical_policy_document(existing_policy_document) == (
+        _canonical_policy_document(template_policy_document)
+    ):
+        # Identical documents are the common case on reconcile,
+        # so skip the far more expensive ignore_order DeepDiff.
+        return response
+
     policy_drift = await aio_wrapper(
         DeepDiff,
         existing_policy_document,
@@ -175,7 +216,7 @@ async def apply_update_managed_policy(
     # the proposed changes. We force type changes to strings here.
 
     if policy_drift:
-        policy_drift = json.loads(policy_drift.to_json())
+        policy_drift = deep_diff_to_dict(policy_drift)
         log_str = "Changes to the PolicyDocument discovered."
         proposed_changes = [
             ProposedChange(
@@ -198,6 +239,7 @@ async def apply_update_managed_policy(
                 policy_drift,
                 log_str,
                 log_params,
+                template_policy_document_json,
             )
             return await plugin_apply_wrapper(apply_awaitable, proposed_changes)
 
@@ -206,7 +248,13 @@ async def apply_update_managed_policy(
 
 
 async def new_policy_version(
-    iam_client, policy_arn, template_policy_document, policy_drift, log_str, log_params
+    iam_client,
+    policy_arn,
+    template_policy_document,
+    policy_drift,
+    log_str,
+    log_params,
+    template_policy_document_json: str = None,
 ):
     if policy_drift:
         policy_versions = await list_managed_policy_versions(iam_client, policy_arn)
@@ -221,7 +269,8 @@ async def new_policy_version(
     await boto_crud_call(
         iam_client.create_policy_version,
         PolicyArn=policy_arn,
-        PolicyDocument=json.dumps(template_policy_document),
+        PolicyDocument=template_policy_document_json
+        or json.dumps(template_policy_document),
     )
     log.debug(log_str, **log_params)
 
@@ -233,18 +282,18 @@ async def apply_managed_policy_tags(
     existing_tags: list[dict],
     log_params: dict,
 ) -> list[ProposedChange]:
-    existing_tag_map = {tag["Key"]: tag.get("Value") for tag in existing_tags}
-    template_tag_map = {tag["Key"]: tag.get("Value") for tag in template_tags}
+    existing_tag_pairs = {(tag["Key"], tag.get("Value")) for tag in existing_tags}
+    template_tag_keys = {tag["Key"] for tag in template_tags}
     tags_to_apply = [
         tag
         for tag in template_tags
-        if tag.get("Value") != existing_tag_map.get(tag["Key"])
+        if (tag["Key"], tag.get("Value")) not in existing_tag_pairs
     ]
     tasks = []
     response = []
 
     if tags_to_remove := [
-        tag["Key"] for tag in existing_tags if not template_tag_map.get(tag["Key"])
+        tag["Key"] for tag in existing_tags if tag["Key"] not in template_tag_keys
     ]:
         log_str = "Stale tags discovered."
         proposed_changes = [
@@ -157,9 +157,7 @@ class AwsIamUserTemplate(AWSTemplate, AccessModel):
         self, aws_account: AWSAccount
     ) -> AccountChangeDetails:
         client = await aws_account.get_boto3_client("iam")
-        self = await remove_expired_resources(
-            self, self.resource_type, self.resource_id
-        )
+        self = remove_expired_resources(self, self.resource_type, self.resource_id)
         account_user = self.apply_resource_dict(aws_account)
 
         user_name = account_user["UserName"]
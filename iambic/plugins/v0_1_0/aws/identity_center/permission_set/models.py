@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import re
 from itertools import chain
 from typing import TYPE_CHECKING, Callable, List, Optional, Union
 
@@ -18,7 +17,11 @@ from iambic.core.models import (
     ProposedChangeType,
     TemplateChangeDetails,
 )
-from iambic.core.utils import aio_wrapper, evaluate_on_provider, plugin_apply_wrapper
+from iambic.core.utils import (
+    compile_rule_regex,
+    evaluate_on_provider,
+    plugin_apply_wrapper,
+)
 from iambic.plugins.v0_1_0.aws.iam.policy.models import PolicyStatement
 from iambic.plugins.v0_1_0.aws.identity_center.permission_set.utils import (
     apply_account_assignments,
@@ -51,6 +54,13 @@ AWS_IDENTITY_CENTER_PERMISSION_SET_TEMPLATE_TYPE = (
 # TODO: Add true support for defining multiple orgs with IdentityCenter rules
 
 
+def _is_account_rule_hit(resource_account: str, account_repr: str) -> bool:
+    if pattern := compile_rule_regex(resource_account.lower()):
+        return bool(pattern.match(account_repr))
+    # Catch accounts with a name that is not a valid regex
+    return resource_account.lower() == account_repr
+
+
 class PermissionSetAccess(AccessModel, ExpiryModel):
     users: list[str] = Field(
         [],
@@ -284,13 +294,7 @@ class AwsIdentityCenterPermissionSetTemplate(
             # If it hits on an excluded account rule, skip
             for account_repr in account_reprs:
                 for resource_account in rule.excluded_accounts:
-                    try:
-                        is_hit = await aio_wrapper(
-                            re.match, resource_account.lower(), account_repr
-                        )
-                    except Exception:
-                        # Catch accounts with a name that is not a valid regex
-                        is_hit = bool(resource_account.lower() == account_repr)
+                    is_hit = _is_account_rule_hit(resource_account, account_repr)
 
                     if is_hit:
                         rule_hit = False
@@ -313,13 +317,7 @@ class AwsIdentityCenterPermissionSetTemplate(
                 #   Stop the check and add the users and groups on the rule
                 for account_repr in account_reprs:
                     for resource_account in rule.included_accounts:
-                        try:
-                            is_hit = await aio_wrapper(
-                                re.match, resource_account.lower(), account_repr
-                            )
-                        except Exception:
-                            # Catch accounts with a name that is not a valid regex
-                            is_hit = bool(resource_account.lower() == account_repr)
+                        is_hit = _is_account_rule_hit(resource_account, account_repr)
 
                         if is_hit:
                             rule_hit = True
@@ -418,7 +416,7 @@ class AwsIdentityCenterPermissionSetTemplate(
         instance_arn = aws_account.identity_center_details.instance_arn
         permission_set_arn = None
         # Marking for deletion. This shouldn't be done on the fly.
-        # self = await remove_expired_resources(
+        # self = remove_expired_resources(
         #     self, self.resource_type, self.resource_id
         # )
         template_permission_set = self.apply_resource_dict(aws_account)
@@ -17,7 +17,10 @@ from urllib.parse import urlparse
 
 import github
 from cryptography.hazmat.primitives import serialization
+from git.exc import GitCommandError
 from github.PullRequest import PullRequest
+from ruamel.yaml import YAML
+from urllib3.util.retry import Retry
 
 import iambic.output.markdown
 from iambic.config.dynamic_config import load_config
@@ -27,13 +30,17 @@ from iambic.core.git import Repo, clone_git_repo, get_remote_default_branch
 from iambic.core.iambic_enum import Command
 from iambic.core.logger import log
 from iambic.core.models import ExecutionMessage, TemplateChangeDetails
-from iambic.core.utils import decode_with_reference_time, yaml
+from iambic.core.utils import decode_with_reference_time
 from iambic.main import run_apply, run_detect, run_expire, run_git_apply, run_git_plan
 from iambic.plugins.v0_1_0.github.iambic_plugin import GithubConfig
 
 iambic_app = __import__("iambic.lambda.app", globals(), locals(), [], 0)
 lambda_run_handler = getattr(iambic_app, "lambda").app.run_handler
 
+# The safe loader is backed by the libyaml C extension when it is available,
+# which is considerably faster than the round-trip loader on large plans.
+safe_yaml = YAML(typ="safe")
+
 
 MERGEABLE_STATE_CLEAN = "clean"
 MERGEABLE_STATE_BLOCKED = "blocked"
@@ -46,6 +53,12 @@ COMMIT_MESSAGE_FOR_IMPORT = "Import changes from import operation"
 COMMIT_MESSAGE_FOR_EXPIRE = "Periodic Expiration"
 COMMIT_MESSAGE_FOR_GIT_APPLY_ABSOLUTE_TIME = "Replace relative time with absolute time"
 SHARED_CONTAINER_GITHUB_DIRECTORY = "/root/data"
+GITHUB_CLIENT_RETRY = Retry(total=3, backoff_factor=0.5)
+GITHUB_CLIENT_POOL_SIZE = 10
+GITHUB_CLIENT_PER_PAGE = 100
+# Maps a templates repo url (without credentials) to the working tree
+# last prepared for it, so warm invocations fetch instead of re-cloning
+_LOCAL_REPO_PATH_CACHE: dict[str, str] = {}
 
 
 def init_shared_data_directory():
@@ -68,6 +81,23 @@ def get_lambda_repo_path() -> str:
     return getattr(iambic_app, "lambda").app.REPO_BASE_PATH
 
 
+async def _load_repo_config(repo_dir: str):
+    # resolve and load in a single event loop instead of one asyncio.run each
+    config_path = await resolve_config_template_path(repo_dir)
+    return await load_config(config_path)
+
+
+def get_github_client(github_token: str) -> github.Github:
+    # All calls made by a handler share the client's pooled session,
+    # so connections to the GitHub API are reused between them.
+    return github.Github(
+        github_token,
+        retry=GITHUB_CLIENT_RETRY,
+        pool_size=GITHUB_CLIENT_POOL_SIZE,
+        per_page=GITHUB_CLIENT_PER_PAGE,
+    )
+
+
 class HandleIssueCommentReturnCode(Enum):
     UNDEFINED = 1
     NO_MATCHING_BODY = 2
@@ -84,7 +114,7 @@ def run_handler(context: dict[str, Any]):
     event_name: str = context["event_name"]
     log_params = {"event_name": event_name}
     log.info("run_handler", **log_params)
-    github_client = github.Github(github_token)
+    github_client = get_github_client(github_token)
 
     getattr(iambic_app, "lambda").app.init_plan_output_path()
     getattr(iambic_app, "lambda").app.init_repo_base_path()
@@ -107,7 +137,7 @@ def handle_iambic_command(
 ) -> None:
     github_token: str = context["iambic"]["GH_OVERRIDE_TOKEN"]
     command: str = context["iambic"]["IAMBIC_CLOUD_IMPORT_CMD"]
-    github_client = github.Github(github_token)
+    github_client = get_github_client(github_token)
     f: Callable[
         [github.Github, dict[str, Any]], None
     ] = IAMBIC_CLOUD_IMPORT_DISPATCH_MAP.get(command)
@@ -125,12 +155,58 @@ def format_github_url(repository_url: str, github_token: str) -> str:
     ).geturl()
 
 
+def _strip_url_credentials(repo_url: str) -> str:
+    # the token embedded by format_github_url changes on every invocation
+    parse_result = urlparse(repo_url)
+    return parse_result._replace(netloc=parse_result.netloc.rpartition("@")[2]).geturl()
+
+
+def _reuse_local_repo(
+    cached_repo_path: str, repo_url: str, repo_path: str, purpose: str
+) -> Repo:
+    if os.path.realpath(cached_repo_path) != os.path.realpath(repo_path):
+        # lambda hands out a new empty repo_path on every invocation,
+        # but /tmp survives warm starts, so move the previous working tree
+        os.rmdir(repo_path)
+        shutil.move(cached_repo_path, repo_path)
+
+    repo = Repo(repo_path)
+    repo.remotes.origin.set_url(repo_url)
+    repo.remotes.origin.fetch(prune=True, depth=1)
+    default_branch = get_remote_default_branch(repo)
+    repo.git.reset("--hard")
+    repo.git.clean("-fdx")
+    repo.git.checkout("-B", f"attempt/{purpose}", f"origin/{default_branch}")
+    return repo
+
+
 def prepare_local_repo_for_new_commits(
     repo_url: str, repo_path: str, purpose: str
 ) -> Repo:
+    repo_key = _strip_url_credentials(repo_url)
+    cached_repo_path = _LOCAL_REPO_PATH_CACHE.pop(repo_key, None)
+    if cached_repo_path and os.path.isdir(os.path.join(cached_repo_path, ".git")):
+        try:
+            repo = _reuse_local_repo(cached_repo_path, repo_url, repo_path, purpose)
+            _LOCAL_REPO_PATH_CACHE[repo_key] = repo_path
+            return repo
+        except (GitCommandError, OSError) as e:
+            log.warning(
+                "Unable to reuse local repo, cloning instead",
+                repo_path=repo_path,
+                exception=str(e),
+            )
+            # a failed move can leave the working tree split between both paths
+            if os.path.realpath(cached_repo_path) != os.path.realpath(repo_path):
+                shutil.rmtree(cached_repo_path, ignore_errors=True)
+            shutil.rmtree(repo_path, ignore_errors=True)
+            os.makedirs(repo_path, exist_ok=True)
+
     if len(os.listdir(repo_path)) > 0:
         raise Exception(f"{repo_path} already exists. This is unexpected.")
-    cloned_repo = clone_git_repo(repo_url, repo_path, None)
+    # detect, import and expire only work on the tip of the default branch,
+    # so skip the history. Pushing a new commit on top of it still works.
+    cloned_repo = clone_git_repo(repo_url, repo_path, None, depth=1)
 
     repo_config_writer = cloned_repo.config_writer()
     repo_config_writer.set_value("user", "name", COMMIT_MESSAGE_USER_NAME)
@@ -139,6 +215,7 @@ def prepare_local_repo_for_new_commits(
 
     default_branch = get_remote_default_branch(cloned_repo)
     cloned_repo.git.checkout("-b", f"attempt/{purpose}", default_branch)
+    _LOCAL_REPO_PATH_CACHE[repo_key] = repo_path
 
     return cloned_repo
 
@@ -150,7 +227,8 @@ def is_last_commit_relative_to_absolute_change(
 
     if len(os.listdir(repo_path)) > 0:
         raise Exception(f"{repo_path} already exists. This is unexpected.")
-    cloned_repo = clone_git_repo(repo_url, repo_path, pull_request_branch_name)
+    # only the last commit message is inspected, so the branch tip is enough
+    cloned_repo = clone_git_repo(repo_url, repo_path, pull_request_branch_name, depth=1)
     return cloned_repo.head.commit.message == COMMIT_MESSAGE_FOR_GIT_APPLY_ABSOLUTE_TIME
 
 
@@ -182,7 +260,7 @@ def load_proposed_changes(filepath: str) -> dict:
     if not os.path.exists(filepath):
         return {}
     with open(filepath, "r") as f:
-        return yaml.load(f)
+        return safe_yaml.load(f)
 
 
 # TODO do more formatting to emphasize resources deletion
@@ -229,14 +307,16 @@ def post_result_as_pr_comment(
         )
     else:
         run_url = "lambda implementation not currently supported run_url"  # FIXME
-    lines = []
+    plan = ""
     if not proposed_changes_path:
         cwd = os.getcwd()
         proposed_changes_path = f"{cwd}/proposed_changes.yaml"
-    if os.path.exists(proposed_changes_path):
+    try:
         with open(proposed_changes_path) as f:
-            lines = f.readlines()
-    plan = "".join(lines) if lines else "no changes"
+            plan = f.read()
+    except FileNotFoundError:
+        pass
+    plan = plan or "no changes"
     body = GIT_APPLY_COMMENT_TEMPLATE.format(
         plan=plan, run_url=run_url, iambic_op=iambic_op
     )
@@ -258,10 +338,11 @@ def copy_data_to_data_directory() -> None:
     cwd = os.getcwd()
     filepath = f"{cwd}/proposed_changes.yaml"
     dest_dir = SHARED_CONTAINER_GITHUB_DIRECTORY
-    if not os.path.exists(dest_dir):
-        os.makedirs(dest_dir)
-    if os.path.exists(filepath):
-        shutil.copy(filepath, f"{dest_dir}/proposed_changes.yaml")
+    os.makedirs(dest_dir, exist_ok=True)
+    try:
+        shutil.copyfile(filepath, f"{dest_dir}/proposed_changes.yaml")
+    except FileNotFoundError:
+        pass
 
 
 IAMBIC_SESSION_NAME_TEMPLATE = "org={org},repo={repo},pr={number}"
@@ -314,7 +395,8 @@ def handle_issue_comment(
     repository_url = context["event"]["repository"]["clone_url"]
     repo_url = format_github_url(repository_url, github_token)
     # repository_url_token
-    templates_repo = github_client.get_repo(repo_name)
+    # lazy=True avoids an extra round-trip; the repo is only used to reach the PR
+    templates_repo = github_client.get_repo(repo_name, lazy=True)
     pull_request = templates_repo.get_pull(pull_number)
     pull_request_branch_name = pull_request.head.ref
     log_params = {"pull_request_branch_name": pull_request_branch_name}
@@ -465,10 +547,9 @@ def _post_artifact_to_companion_repository(
 ):
     url = None
     try:
-        lines = []
         if os.path.exists(proposed_changes_path):
             with open(proposed_changes_path) as f:
-                lines = f.readlines()
+                proposed_changes = f.read()
             gist_repo_name = f"{templates_repo.full_name}-gist"
             gist_repo = github_client.get_repo(gist_repo_name)
             now_timestamp = datetime.datetime.now()
@@ -477,7 +558,7 @@ def _post_artifact_to_companion_repository(
                 f"{pr_prefix}/{op_name}/{now_timestamp}/{default_base_name}"
             )
             md_repo_path = f"{pr_prefix}/{op_name}/{now_timestamp}/summary.md"
-            gist_repo.create_file(yaml_repo_path, op_name, "".join(lines))
+            gist_repo.create_file(yaml_repo_path, op_name, proposed_changes)
             result = gist_repo.create_file(md_repo_path, op_name, markdown_summary)
             url = result["content"].html_url
     except Exception:
@@ -559,11 +640,10 @@ def handle_iambic_approve(
     try:
         repo_dir = get_lambda_repo_path()
         _ = prepare_local_repo_for_new_commits(repo_url, repo_dir, "detect")
-        config_path = asyncio.run(resolve_config_template_path(repo_dir))
         # it's important to load the config from main branch
         # we want to guard against a requester directly changing the approver
         # knowledge in the config of the iambic-template repository
-        main_config = asyncio.run(load_config(config_path))
+        main_config = asyncio.run(_load_repo_config(repo_dir))
         github_main_config: GithubConfig = main_config.github
         allowed_bot_approvers = github_main_config.allowed_bot_approvers
         matching_approvers = [
@@ -720,12 +800,13 @@ def handle_pull_request(github_client: github.Github, context: dict[str, Any]) -
     # replace with a different github client because we need a different
     # identity to leave the "iambic git-plan". Otherwise, it won't be able
     # to trigger the correct react-to-comment workflow.
-    github_client = github.Github(context["iambic"]["GH_OVERRIDE_TOKEN"])
+    github_client = get_github_client(context["iambic"]["GH_OVERRIDE_TOKEN"])
     # repo_name is already in the format {repo_owner}/{repo_short_name}
     repo_name = context["repository"]
     pull_number = context["event"]["pull_request"]["number"]
     # repository_url_token
-    templates_repo = github_client.get_repo(repo_name)
+    # lazy=True avoids an extra round-trip; the repo is only used to reach the PR
+    templates_repo = github_client.get_repo(repo_name, lazy=True)
     pull_request = templates_repo.get_pull(pull_number)
 
     try:
@@ -790,6 +871,11 @@ def handle_import(github_client: github.Github, context: dict[str, Any]) -> None
     _handle_import(repo_url, default_branch)
 
 
+async def _run_import(exe_message: ExecutionMessage, repo_dir: str):
+    config = await _load_repo_config(repo_dir)
+    await config.run_import(exe_message, repo_dir)
+
+
 def _handle_import(repo_url: str, default_branch: str) -> list[TemplateChangeDetails]:
     try:
         exe_message = ExecutionMessage(
@@ -797,9 +883,7 @@ def _handle_import(repo_url: str, default_branch: str) -> list[TemplateChangeDet
         )
         repo_dir = get_lambda_repo_path()
         repo = prepare_local_repo_for_new_commits(repo_url, repo_dir, "import")
-        config_path = asyncio.run(resolve_config_template_path(repo_dir))
-        config = asyncio.run(load_config(config_path))
-        asyncio.run(config.run_import(exe_message, repo_dir))
+        asyncio.run(_run_import(exe_message, repo_dir))
         repo.git.add(".")
         diff_list = repo.head.commit.diff()
         if len(diff_list) > 0:
@@ -817,8 +901,7 @@ def _handle_enforce(repo_url: str, default_branch: str) -> list[TemplateChangeDe
     try:
         local_repo_path = get_lambda_repo_path()
         _ = prepare_local_repo_for_new_commits(repo_url, local_repo_path, "enforce")
-        config_path = asyncio.run(resolve_config_template_path(local_repo_path))
-        config = asyncio.run(load_config(config_path))
+        config = asyncio.run(_load_repo_config(local_repo_path))
         # we are not restoring teh original ctx because we expect
         # this is called in a completely separate process
         ctx.eval_only = False
@@ -865,13 +948,17 @@ def _handle_expire(repo_url: str, default_branch: str) -> list[TemplateChangeDet
             lambda_run_handler(None, {"command": "git_apply"})
 
             # if it's in a PR, it's more natural to upload the proposed_changes.yaml to somewhere
-            # current implementation, it's just logging to standard out
-            lines = []
+            # current implementation, it only logs where the plan is so the log
+            # line stays the same size regardless of how large the plan is
             filepath = getattr(iambic_app, "lambda").app.PLAN_OUTPUT_PATH
-            if os.path.exists(filepath):
-                with open(filepath) as f:
-                    lines = f.readlines()
-            log_params = {"proposed_changes": lines}
+            try:
+                proposed_changes_size = os.stat(filepath).st_size
+            except FileNotFoundError:
+                proposed_changes_size = 0
+            log_params = {
+                "proposed_changes_path": filepath,
+                "proposed_changes_size": proposed_changes_size,
+            }
             log.info("handle_expire ran", **log_params)
 
             default_branch = get_remote_default_branch(repo)
@@ -2,32 +2,39 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
+import base64
 import hmac
-import json
 import os
 import tempfile
 import time
-from typing import Any, Callable
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Union
 from urllib.parse import urlparse
 
-import aiohttp
 import boto3
 import github
 import jwt
+import requests
 from botocore.exceptions import ClientError
+from cryptography.hazmat.primitives import serialization
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import iambic.core.utils
 import iambic.plugins.v0_1_0.github.github
+from iambic.core import noq_json as json
 
 # from iambic.core.git import get_remote_default_branch
 from iambic.core.logger import log
+from iambic.core.utils import aio_wrapper
 from iambic.plugins.v0_1_0.github.github import (
     HandleIssueCommentReturnCode,
     _handle_detect_changes_from_eventbridge,
     _handle_enforce,
     _handle_expire,
     _handle_import,
+    get_github_client,
     github_app_workflow_wrapper,
     handle_iambic_approve,
     handle_iambic_git_apply,
@@ -52,29 +59,72 @@ def format_github_url(repository_url: str, github_token: str) -> str:
     ).geturl()
 
 
+# App JWTs are valid for 10 minutes and installation tokens for an hour.
+# Both are reused until shortly before they expire.
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+_APP_JWT_CACHE: dict[str, tuple[str, float]] = {}
+_INSTALLATION_TOKEN_CACHE: dict[tuple[str, str], tuple[str, float]] = {}
+_APP_PRIVATE_KEY_CACHE: dict[str, Any] = {}
+
+
+def load_app_private_key(private_key: str):
+    # jwt.encode parses a PEM string on every call, so keep the parsed key
+    # for as long as the secret does not change.
+    if (parsed_key := _APP_PRIVATE_KEY_CACHE.get(private_key)) is None:
+        parsed_key = serialization.load_pem_private_key(
+            private_key.encode("utf-8"), password=None
+        )
+        _APP_PRIVATE_KEY_CACHE.clear()
+        _APP_PRIVATE_KEY_CACHE[private_key] = parsed_key
+    return parsed_key
+
+
 def get_app_bearer_token(private_key, app_id) -> str:
+    if (cached := _APP_JWT_CACHE.get(app_id)) and cached[1] > time.time():
+        return cached[0]
+
+    now = int(time.time())
     payload = {
         # Issued at time
-        "iat": int(time.time()),
+        "iat": now,
         # JWT expiration time (10 minutes maximum)
-        "exp": int(time.time()) + 600,
+        "exp": now + 600,
         # GitHub App's identifier
         "iss": app_id,
     }
 
     # Create JWT
-    return jwt.encode(payload, private_key, algorithm="RS256")
+    encoded_jwt = jwt.encode(
+        payload, load_app_private_key(private_key), algorithm="RS256"
+    )
+    _APP_JWT_CACHE[app_id] = (
+        encoded_jwt,
+        payload["exp"] - TOKEN_EXPIRY_MARGIN_SECONDS,
+    )
+    return encoded_jwt
 
 
-def get_app_private_key_as_lambda_context():
-    # assuming we are already in an lambda execution context
-    secret_name = os.environ["GITHUB_APP_SECRET_KEY_SECRET_ID"]
-    region_name = os.environ["AWS_REGION"]
+# Secrets Manager clients and secret values are kept at module scope,
+# so warm lambda invocations skip the client construction and network calls
+SECRET_CACHE_TTL_SECONDS = 300
+_SECRETS_MANAGER_CLIENTS: dict[str, Any] = {}
+_SECRET_STRING_CACHE: dict[tuple[str, str], tuple[float, str]] = {}
 
-    # Create a Secrets Manager client
-    session = boto3.session.Session()
-    client = session.client(service_name="secretsmanager", region_name=region_name)
 
+def get_secrets_manager_client(region_name: str):
+    if (client := _SECRETS_MANAGER_CLIENTS.get(region_name)) is None:
+        session = boto3.session.Session()
+        client = session.client(service_name="secretsmanager", region_name=region_name)
+        _SECRETS_MANAGER_CLIENTS[region_name] = client
+    return client
+
+
+def get_secret_string(secret_name: str, region_name: str) -> str:
+    cache_key = (region_name, secret_name)
+    if (cached := _SECRET_STRING_CACHE.get(cache_key)) and cached[0] > time.monotonic():
+        return cached[1]
+
+    client = get_secrets_manager_client(region_name)
     try:
         get_secret_value_response = client.get_secret_value(SecretId=secret_name)
     except ClientError as e:
@@ -83,30 +133,52 @@ def get_app_private_key_as_lambda_context():
         raise e
 
     # Decrypts secret using the associated KMS key.
-    return get_secret_value_response["SecretString"]
+    secret_string = get_secret_value_response["SecretString"]
+    _SECRET_STRING_CACHE[cache_key] = (
+        time.monotonic() + SECRET_CACHE_TTL_SECONDS,
+        secret_string,
+    )
+    return secret_string
+
+
+def get_app_private_key_as_lambda_context():
+    # assuming we are already in an lambda execution context
+    return get_secret_string(
+        os.environ["GITHUB_APP_SECRET_KEY_SECRET_ID"], os.environ["AWS_REGION"]
+    )
 
 
 def get_app_webhook_secret_as_lambda_context():
     # assuming we are already in an lambda execution context
-    secret_name = os.environ["GITHUB_APP_WEBHOOK_SECRET_SECRET_ID"]
-    region_name = os.environ["AWS_REGION"]
+    return get_secret_string(
+        os.environ["GITHUB_APP_WEBHOOK_SECRET_SECRET_ID"], os.environ["AWS_REGION"]
+    )
 
-    # Create a Secrets Manager client
-    session = boto3.session.Session()
-    client = session.client(service_name="secretsmanager", region_name=region_name)
 
-    try:
-        get_secret_value_response = client.get_secret_value(SecretId=secret_name)
-    except ClientError as e:
-        # For a list of exceptions thrown, see
-        # https://docs.aws.amazon.com/secretsmanager/latest/apireference/API_GetSecretValue.html
-        raise e
+def _build_github_api_session() -> requests.Session:
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET", "POST"],
+    )
+    session.mount(
+        "https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    )
+    return session
 
-    # Decrypts secret using the associated KMS key.
-    return get_secret_value_response["SecretString"]
+
+# Kept at module scope so warm lambda invocations reuse the connection
+# to api.github.com instead of doing a new TLS handshake per call
+_GITHUB_API_SESSION = _build_github_api_session()
 
 
 async def _get_installation_token(app_id, installation_id):
+    cache_key = (app_id, installation_id)
+    if (cached := _INSTALLATION_TOKEN_CACHE.get(cache_key)) and cached[1] > time.time():
+        return cached[0]
+
     encoded_jwt = get_app_bearer_token(get_app_private_key_as_lambda_context(), app_id)
     access_tokens_url = (
         f"https://api.github.com/app/installations/{installation_id}/access_tokens"
@@ -115,11 +187,37 @@ async def _get_installation_token(app_id, installation_id):
         "Accept": "application/vnd.github+json",
         "Authorization": f"Bearer {encoded_jwt}",
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(access_tokens_url, headers=headers) as resp:
-            payload = json.loads(await resp.text())
-            installation_token = payload["token"]
-            return installation_token
+    resp = await aio_wrapper(
+        _GITHUB_API_SESSION.post, access_tokens_url, headers=headers
+    )
+    payload = json.loads(resp.content)
+    installation_token = payload["token"]
+    if expires_at := payload.get("expires_at"):
+        # expires_at is in the format of 2016-07-11T22:14:10Z
+        expires_at = datetime.strptime(expires_at, "%Y-%m-%dT%H:%M:%SZ").replace(
+            tzinfo=timezone.utc
+        )
+        _INSTALLATION_TOKEN_CACHE[cache_key] = (
+            installation_token,
+            expires_at.timestamp() - TOKEN_EXPIRY_MARGIN_SECONDS,
+        )
+    return installation_token
+
+
+# One client per installation, replaced when its token rotates, so warm
+# invocations keep the client's pooled connections to the GitHub API
+_GITHUB_CLIENT_CACHE: dict[tuple[str, str], tuple[str, github.Github]] = {}
+
+
+def _get_github_client(app_id, installation_id, github_token: str) -> github.Github:
+    cache_key = (app_id, installation_id)
+    cached = _GITHUB_CLIENT_CACHE.get(cache_key)
+    if cached and cached[0] == github_token:
+        return cached[1]
+
+    github_client = get_github_client(github_token)
+    _GITHUB_CLIENT_CACHE[cache_key] = (github_token, github_client)
+    return github_client
 
 
 def run_handler(event=None, context=None):
@@ -137,17 +235,32 @@ def run_handler(event=None, context=None):
         1
     ]  # the format is in sha256=<sig>
 
-    # verify webhooks security secrets
+    # verify webhooks security secrets against the exact bytes GitHub signed
     payload = event["body"]
+    if event.get("isBase64Encoded"):
+        payload = base64.b64decode(payload)
     verify_signature(request_signature, payload)
 
-    webhook_payload = json.loads(event["body"])
+    webhook_payload = json.loads(payload)
+
+    # Filter out unsupported events and actions before minting an
+    # installation token and preparing the filesystem
+    f = EVENT_DISPATCH_MAP.get(github_event)
+    if not f:
+        log.error("no supported handler")
+        raise Exception("no supported handler")
+    action = webhook_payload.get("action")
+    if action not in EVENT_ACTIONS_MAP[github_event]:
+        log_params = {"github_event": github_event, "action": action}
+        log.info("github_app ignore unsupported action", **log_params)
+        return
+
     installation_id = webhook_payload["installation"]["id"]
     github_override_token = asyncio.run(
         _get_installation_token(app_id, installation_id)
     )
 
-    github_client = github.Github(github_override_token)
+    github_client = _get_github_client(app_id, installation_id, github_override_token)
 
     # Handle lambda environment can only write to /tmp and make sure we don't leave previous
     # state on a new function execution
@@ -160,27 +273,21 @@ def run_handler(event=None, context=None):
     iambic.plugins.v0_1_0.github.github.init_shared_data_directory()
     iambic.core.utils.init_writable_directory()
 
-    f: Callable[[str, github.Github, dict[str, Any]]] = EVENT_DISPATCH_MAP.get(
-        github_event
-    )
-    if f:
-        f(github_override_token, github_client, webhook_payload)
-    else:
-        log.error("no supported handler")
-        raise Exception("no supported handler")
+    f(github_override_token, github_client, webhook_payload)
 
 
 def handle_pull_request(
     github_token: str, github_client: github.Github, webhook_payload: dict[str, Any]
 ) -> None:
     action = webhook_payload["action"]
-    if action not in ["opened", "synchronize"]:
+    if action not in EVENT_ACTIONS_MAP["pull_request"]:
         return
 
     repo_name = webhook_payload["repository"]["full_name"]
     pull_number = webhook_payload["pull_request"]["number"]
     # repository_url_token
-    templates_repo = github_client.get_repo(repo_name)
+    # lazy=True avoids an extra round-trip; the repo is only used to reach the PR
+    templates_repo = github_client.get_repo(repo_name, lazy=True)
     pull_request = templates_repo.get_pull(pull_number)
     repository_url = webhook_payload["repository"]["clone_url"]
     repo_url = format_github_url(repository_url, github_token)
@@ -218,7 +325,7 @@ def handle_issue_comment(
     github_token: str, github_client: github.Github, webhook_payload: dict[str, Any]
 ) -> HandleIssueCommentReturnCode:
     action = webhook_payload["action"]
-    if action != "created":
+    if action not in EVENT_ACTIONS_MAP["issue_comment"]:
         return
 
     comment_body = webhook_payload["comment"]["body"]
@@ -228,7 +335,8 @@ def handle_issue_comment(
 
     command_lookup = comment_body.split("\n")[0].strip()
 
-    if command_lookup not in COMMENT_DISPATCH_MAP:
+    comment_func = COMMENT_DISPATCH_MAP.get(command_lookup)
+    if not comment_func:
         log_params = {
             "command_lookup": command_lookup,
             "comment_body": comment_body,
@@ -246,20 +354,17 @@ def handle_issue_comment(
     repo_name = webhook_payload["repository"]["full_name"]
     pull_number = webhook_payload["issue"]["number"]
     # repository_url_token
-    templates_repo = github_client.get_repo(repo_name)
+    # lazy=True avoids an extra round-trip; the repo is only used to reach the PR
+    templates_repo = github_client.get_repo(repo_name, lazy=True)
     pull_request = templates_repo.get_pull(pull_number)
 
     # repo_name is already in the format {repo_owner}/{repo_short_name}
     repository_url = webhook_payload["repository"]["clone_url"]
     repo_url = format_github_url(repository_url, github_token)
-    # repository_url_token
-    templates_repo = github_client.get_repo(repo_name)
-    pull_request = templates_repo.get_pull(pull_number)
     pull_request_branch_name = pull_request.head.ref
     log_params = {"pull_request_branch_name": pull_request_branch_name}
     log.info("PR remote branch name", **log_params)
 
-    comment_func: Callable = COMMENT_DISPATCH_MAP[command_lookup]
     return comment_func(
         None,
         github_client,
@@ -279,12 +384,13 @@ def handle_workflow_run(
     github_token: str, github_client: github.Github, webhook_payload: dict[str, Any]
 ) -> None:
     action = webhook_payload["action"]
-    if action != "requested":
+    if action not in EVENT_ACTIONS_MAP["workflow_run"]:
         return
 
     workflow_path = webhook_payload["workflow_run"]["path"]
 
-    if workflow_path not in WORKFLOW_DISPATCH_MAP:
+    workflow_func = WORKFLOW_DISPATCH_MAP.get(workflow_path)
+    if not workflow_func:
         log_params = {"workflow_path": workflow_path}
         log.error("handle_workflow_run: no op", **log_params)
         return
@@ -296,7 +402,6 @@ def handle_workflow_run(
     templates_repo = github_client.get_repo(repo_name)
     default_branch = templates_repo.default_branch
 
-    workflow_func: Callable = WORKFLOW_DISPATCH_MAP[workflow_path]
     return workflow_func(
         github_client,
         templates_repo,
@@ -307,50 +412,72 @@ def handle_workflow_run(
     )
 
 
-EVENT_DISPATCH_MAP: dict[str, Callable] = {
-    "issue_comment": handle_issue_comment,
-    "pull_request": handle_pull_request,
-    "workflow_run": handle_workflow_run,
-}
-
-
-COMMENT_DISPATCH_MAP: dict[str, Callable] = {
-    "iambic git-apply": handle_iambic_git_apply,
-    "iambic git-plan": handle_iambic_git_plan,
-    "iambic apply": handle_iambic_git_apply,
-    "iambic plan": handle_iambic_git_plan,
-    "iambic approve": handle_iambic_approve,
-}
-
-WORKFLOW_DISPATCH_MAP: dict[str, Callable] = {
-    ".github/workflows/iambic-enforce.yml": github_app_workflow_wrapper(
-        _handle_enforce, "enforce"
-    ),
-    ".github/workflows/iambic-expire.yml": github_app_workflow_wrapper(
-        _handle_expire, "expire"
-    ),
-    ".github/workflows/iambic-import.yml": github_app_workflow_wrapper(
-        _handle_import, "import"
-    ),
-    ".github/workflows/iambic-detect.yml": github_app_workflow_wrapper(
-        _handle_detect_changes_from_eventbridge, "detect"
-    ),
-}
+# Read-only so the dispatch tables can't be altered at runtime
+EVENT_DISPATCH_MAP: Mapping[str, Callable] = MappingProxyType(
+    {
+        "issue_comment": handle_issue_comment,
+        "pull_request": handle_pull_request,
+        "workflow_run": handle_workflow_run,
+    }
+)
+
+# The webhook actions each event handler acts on, anything else is a no-op
+EVENT_ACTIONS_MAP: Mapping[str, frozenset[str]] = MappingProxyType(
+    {
+        "issue_comment": frozenset({"created"}),
+        "pull_request": frozenset({"opened", "synchronize"}),
+        "workflow_run": frozenset({"requested"}),
+    }
+)
+
+
+COMMENT_DISPATCH_MAP: Mapping[str, Callable] = MappingProxyType(
+    {
+        "iambic git-apply": handle_iambic_git_apply,
+        "iambic git-plan": handle_iambic_git_plan,
+        "iambic apply": handle_iambic_git_apply,
+        "iambic plan": handle_iambic_git_plan,
+        "iambic approve": handle_iambic_approve,
+    }
+)
+
+WORKFLOW_DISPATCH_MAP: Mapping[str, Callable] = MappingProxyType(
+    {
+        ".github/workflows/iambic-enforce.yml": github_app_workflow_wrapper(
+            _handle_enforce, "enforce"
+        ),
+        ".github/workflows/iambic-expire.yml": github_app_workflow_wrapper(
+            _handle_expire, "expire"
+        ),
+        ".github/workflows/iambic-import.yml": github_app_workflow_wrapper(
+            _handle_import, "import"
+        ),
+        ".github/workflows/iambic-detect.yml": github_app_workflow_wrapper(
+            _handle_detect_changes_from_eventbridge, "detect"
+        ),
+    }
+)
+
+
+def _calculate_digest(webhook_secret: str, payload: Union[str, bytes]) -> bytes:
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    # one-shot hmac.digest skips building an HMAC object per call
+    return hmac.digest(webhook_secret.encode("utf-8"), payload, "sha256")
 
 
 # Use to verify Github App Webhook Secret Using SHA256
-def calculate_signature(webhook_secret: str, payload: str) -> str:
-    secret_in_bytes = bytes(webhook_secret, "utf-8")
-    digest = hmac.new(
-        key=secret_in_bytes, msg=payload.encode("utf-8"), digestmod=hashlib.sha256
-    )
-    signature = digest.hexdigest()
-    return signature
+def calculate_signature(webhook_secret: str, payload: Union[str, bytes]) -> str:
+    return _calculate_digest(webhook_secret, payload).hex()
 
 
-def verify_signature(sig: str, payload: str) -> None:
-    good_sig = calculate_signature(get_app_webhook_secret_as_lambda_context(), payload)
-    if not hmac.compare_digest(good_sig, sig):
+def verify_signature(sig: str, payload: Union[str, bytes]) -> None:
+    try:
+        sig_digest = bytes.fromhex(sig)
+    except ValueError:
+        raise Exception("Bad signature")
+    good_digest = _calculate_digest(get_app_webhook_secret_as_lambda_context(), payload)
+    if not hmac.compare_digest(good_digest, sig_digest):
         raise Exception("Bad signature")
 
 
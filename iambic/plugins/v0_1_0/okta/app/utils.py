@@ -2,25 +2,46 @@ from __future__ import annotations
 
 import asyncio
 import functools
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
 import okta.models as models
 
 from iambic.core.context import ctx
 from iambic.core.logger import log
 from iambic.core.models import ProposedChange, ProposedChangeType
-from iambic.core.utils import GlobalRetryController
-from iambic.plugins.v0_1_0.okta.group.utils import get_group
-from iambic.plugins.v0_1_0.okta.models import App, Assignment, Group
+from iambic.core.utils import GlobalRetryController, NoqSemaphore
+from iambic.plugins.v0_1_0.okta.models import App, Assignment
 from iambic.plugins.v0_1_0.okta.utils import handle_okta_fn
 
 if TYPE_CHECKING:
     from iambic.plugins.v0_1_0.okta.iambic_plugin import OktaOrganization
 
 
+async def _get_user_login(client, user_id: str) -> str:
+    async with GlobalRetryController(fn_identifier="okta.get_user") as retry_controller:
+        fn = functools.partial(client.get_user, user_id)
+        user_okta, _, err = await retry_controller(handle_okta_fn, fn)
+    if err:
+        if isinstance(err, asyncio.exceptions.TimeoutError):
+            raise err
+        log.error("Error encountered when getting user", error=str(err))
+        raise Exception("Error encountered when getting user")
+    return user_okta.profile.login
+
+
 async def list_app_user_assignments(
-    okta_organization: OktaOrganization, app: App
+    okta_organization: OktaOrganization,
+    app: App,
+    user_login_cache: Optional[dict[str, asyncio.Future]] = None,
 ) -> dict:
+    """
+    List the logins of the users directly assigned to the app.
+
+    user_login_cache maps a user id to the lookup of its login, sharing it
+    across apps means each user is only fetched once when listing all apps.
+    """
+    if user_login_cache is None:
+        user_login_cache = {}
     client = await okta_organization.get_okta_client()
     async with GlobalRetryController(
         fn_identifier="okta.list_application_users"
@@ -36,17 +57,11 @@ async def list_app_user_assignments(
         for user in app_user_list:
             if user.scope == "GROUP":
                 continue
-            async with GlobalRetryController(
-                fn_identifier="okta.get_user"
-            ) as retry_controller:
-                fn = functools.partial(client.get_user, user.id)
-                user_okta, _, err = await retry_controller(handle_okta_fn, fn)
-            if err:
-                if isinstance(err, asyncio.exceptions.TimeoutError):
-                    raise err
-                log.error("Error encountered when getting user", error=str(err))
-                raise Exception("Error encountered when getting user")
-            user_assignments.append(user_okta.profile.login)
+            if user.id not in user_login_cache:
+                user_login_cache[user.id] = asyncio.ensure_future(
+                    _get_user_login(client, user.id)
+                )
+            user_assignments.append(await user_login_cache[user.id])
 
     return {
         "app_id": app.id,
@@ -164,6 +179,7 @@ async def list_all_apps(okta_organization: OktaOrganization) -> List[App]:
 
     tasks = []
     apps = []
+    user_login_cache = {}
     for app_raw in raw_apps:
         app = App(
             id=app_raw.id,
@@ -175,7 +191,9 @@ async def list_all_apps(okta_organization: OktaOrganization) -> List[App]:
             ),
         )
         apps.append(app)
-        tasks.append(list_app_user_assignments(okta_organization, app))
+        tasks.append(
+            list_app_user_assignments(okta_organization, app, user_login_cache)
+        )
         tasks.append(list_app_group_assignments(okta_organization, app))
     app_assignments = await asyncio.gather(*tasks)
     apps_to_return = []
@@ -190,6 +208,117 @@ async def list_all_apps(okta_organization: OktaOrganization) -> List[App]:
     return apps_to_return
 
 
+async def _get_okta_user(client, assignment: str, log_params: dict[str, str]):
+    async with GlobalRetryController(fn_identifier="okta.get_user") as retry_controller:
+        fn = functools.partial(client.get_user, assignment)
+        user_okta, _, err = await retry_controller(handle_okta_fn, fn)
+    if err:
+        log.error("Error retrieving user", user=assignment, **log_params)
+        return None
+    return user_okta
+
+
+async def _get_okta_group(client, assignment: str, log_params: dict[str, str]):
+    # Only the Okta group is needed for an assignment, so search by name directly
+    # rather than through get_group which also fetches every member of the group.
+    async with GlobalRetryController(
+        fn_identifier="okta.list_groups"
+    ) as retry_controller:
+        fn = functools.partial(client.list_groups, query_params={"q": assignment})
+        groups, _, err = await retry_controller(handle_okta_fn, fn)
+    if not err:
+        for group_okta in groups or []:
+            if group_okta.profile.name == assignment:
+                return group_okta
+    log.error("Error retrieving group", group=assignment, **log_params)
+    return None
+
+
+async def _assign_user_to_app(
+    client,
+    app: App,
+    assignment: str,
+    log_params: dict[str, str],
+):
+    if not (user_okta := await _get_okta_user(client, assignment, log_params)):
+        return
+    app_user = models.AppUser({"id": user_okta.id})
+    async with GlobalRetryController(
+        fn_identifier="okta.assign_user_to_application"
+    ) as retry_controller:
+        fn = functools.partial(client.assign_user_to_application, app.id, app_user)
+        _, _, err = await retry_controller(handle_okta_fn, fn)
+    if err:
+        log.error("Error assigning user to app", user=assignment, **log_params)
+
+
+async def _assign_group_to_app(
+    client,
+    app: App,
+    assignment: str,
+    log_params: dict[str, str],
+):
+    if not (group_okta := await _get_okta_group(client, assignment, log_params)):
+        return
+    group_assignment = models.ApplicationGroupAssignment(
+        {
+            "id": group_okta.id,
+        }
+    )
+    async with GlobalRetryController(
+        fn_identifier="okta.create_application_group_assignment"
+    ) as retry_controller:
+        fn = functools.partial(
+            client.create_application_group_assignment,
+            app.id,
+            group_okta.id,
+            group_assignment,
+        )
+        _, _, err = await retry_controller(handle_okta_fn, fn)
+    if err:
+        log.error("Error assigning group to app", group=assignment, **log_params)
+
+
+async def _unassign_user_from_app(
+    client,
+    app: App,
+    assignment: str,
+    log_params: dict[str, str],
+):
+    if not (user_okta := await _get_okta_user(client, assignment, log_params)):
+        return
+    async with GlobalRetryController(
+        fn_identifier="okta.delete_application_user"
+    ) as retry_controller:
+        fn = functools.partial(client.delete_application_user, app.id, user_okta.id)
+        _, err = await retry_controller(handle_okta_fn, fn)
+    if err:
+        log.error("Error unassigning user from app", user=assignment, **log_params)
+
+
+async def _unassign_group_from_app(
+    client,
+    app: App,
+    assignment: str,
+    log_params: dict[str, str],
+):
+    if not (group_okta := await _get_okta_group(client, assignment, log_params)):
+        return
+    async with GlobalRetryController(
+        fn_identifier="okta.delete_application_group_assignment"
+    ) as retry_controller:
+        fn = functools.partial(
+            client.delete_application_group_assignment, app.id, group_okta.id
+        )
+        _, err = await retry_controller(handle_okta_fn, fn)
+    if err:
+        log.error("Error unassigning group from app", group=assignment, **log_params)
+
+
+async def _update_app_assignment(assignment_fn, **kwargs):
+    return await assignment_fn(**kwargs)
+
+
 async def update_app_assignments(
     app: App,
     new_assignments: List[Assignment],
@@ -217,15 +346,18 @@ async def update_app_assignments(
     desired_user_assignments = [
         assignment.user for assignment in new_assignments if assignment.user
     ]
+    # Membership is checked against sets while iterating the lists to keep the change order stable
+    current_user_assignment_set = set(current_user_assignments)
+    desired_user_assignment_set = set(desired_user_assignments)
     user_assignments_to_unassign = [
         assignment
         for assignment in current_user_assignments
-        if assignment not in desired_user_assignments
+        if assignment not in desired_user_assignment_set
     ]
     user_assignments_to_assign = [
         assignment
         for assignment in desired_user_assignments
-        if assignment not in current_user_assignments
+        if assignment not in current_user_assignment_set
     ]
 
     current_group_assignments = [
@@ -234,16 +366,17 @@ async def update_app_assignments(
     desired_group_assignments = [
         assignment.group for assignment in new_assignments if assignment.group
     ]
+    current_group_assignment_set = set(current_group_assignments)
+    desired_group_assignment_set = set(desired_group_assignments)
     group_assignments_to_unassign = [
         assignment
         for assignment in current_group_assignments
-        if assignment not in desired_group_assignments
+        if assignment not in desired_group_assignment_set
     ]
-
     group_assignments_to_assign = [
         assignment
         for assignment in desired_group_assignments
-        if assignment not in current_group_assignments
+        if assignment not in current_group_assignment_set
     ]
 
     assignments_to_unassign = bool(
@@ -287,115 +420,28 @@ async def update_app_assignments(
         )
 
     if ctx.execute:
-        for assignment in user_assignments_to_assign:
-            async with GlobalRetryController(
-                fn_identifier="okta.get_user"
-            ) as retry_controller:
-                fn = functools.partial(client.get_user, assignment)
-                user_okta, _, err = await retry_controller(handle_okta_fn, fn)
-            if err:
-                log.error("Error retrieving user", user=assignment, **log_params)
-                continue
-            app_user = models.AppUser({"id": user_okta.id})
-            async with GlobalRetryController(
-                fn_identifier="okta.assign_user_to_application"
-            ) as retry_controller:
-                fn = functools.partial(
-                    client.assign_user_to_application, app.id, app_user
-                )
-                _, _, err = await retry_controller(handle_okta_fn, fn)
-            if err:
-                log.error(
-                    "Error assigning user to app",
-                    user=assignment.user,
-                    **log_params,
-                )
-                continue
-        for assignment in group_assignments_to_assign:
-            group: Group = await get_group("", assignment, okta_organization)
-            if not group:
-                log.error("Error retrieving group", group=assignment, **log_params)
-                continue
-            async with GlobalRetryController(
-                fn_identifier="okta.get_group"
-            ) as retry_controller:
-                fn = functools.partial(client.get_group, group.group_id)
-                group_okta, _, err = await retry_controller(handle_okta_fn, fn)
-            if err:
-                log.error("Error retrieving group", group=assignment, **log_params)
-                continue
-            group_assignment = models.ApplicationGroupAssignment(
+        # Each assignment is a handful of independent round trips,
+        # so run them concurrently within Okta's concurrent request limit
+        assignment_tasks = [
+            (_assign_user_to_app, user_assignments_to_assign),
+            (_assign_group_to_app, group_assignments_to_assign),
+            (_unassign_user_from_app, user_assignments_to_unassign),
+            (_unassign_group_from_app, group_assignments_to_unassign),
+        ]
+        update_assignment_semaphore = NoqSemaphore(_update_app_assignment, 75)
+        await update_assignment_semaphore.process(
+            [
                 {
-                    "id": group_okta.id,
+                    "assignment_fn": assignment_fn,
+                    "client": client,
+                    "app": app,
+                    "assignment": assignment,
+                    "log_params": log_params,
                 }
-            )
-            async with GlobalRetryController(
-                fn_identifier="okta.create_application_group_assignment"
-            ) as retry_controller:
-                fn = functools.partial(
-                    client.create_application_group_assignment,
-                    app.id,
-                    group_okta.id,
-                    group_assignment,
-                )
-                _, _, err = await retry_controller(handle_okta_fn, fn)
-            if err:
-                log.error(
-                    "Error assigning group to app",
-                    group=assignment.oup,
-                    **log_params,
-                )
-                continue
-        for assignment in user_assignments_to_unassign:
-            async with GlobalRetryController(
-                fn_identifier="okta.get_user"
-            ) as retry_controller:
-                fn = functools.partial(client.get_user, assignment)
-                user_okta, _, err = await retry_controller(handle_okta_fn, fn)
-            if err:
-                log.error("Error retrieving user", user=assignment, **log_params)
-                continue
-            async with GlobalRetryController(
-                fn_identifier="okta.delete_application_user"
-            ) as retry_controller:
-                fn = functools.partial(
-                    client.delete_application_user, app.id, user_okta.id
-                )
-                _, err = await retry_controller(handle_okta_fn, fn)
-            if err:
-                log.error(
-                    "Error unassigning user from app",
-                    user=assignment.user,
-                    **log_params,
-                )
-                continue
-        for assignment in group_assignments_to_unassign:
-            group: Group = await get_group("", assignment, okta_organization)
-            if not group:
-                log.error("Error retrieving group", group=assignment, **log_params)
-                continue
-            async with GlobalRetryController(
-                fn_identifier="okta.get_group"
-            ) as retry_controller:
-                fn = functools.partial(client.get_group, group.group_id)
-                group_okta, _, err = await retry_controller(handle_okta_fn, fn)
-            if err:
-                log.error("Error retrieving group", group=assignment, **log_params)
-                continue
-            async with GlobalRetryController(
-                fn_identifier="okta.delete_application_group_assignment"
-            ) as retry_controller:
-                fn = functools.partial(
-                    client.delete_application_group_assignment, app.id, group_okta.id
-                )
-                _, err = await retry_controller(handle_okta_fn, fn)
-            if err:
-                log.error(
-                    "Error unassigning group from app",
-                    group=assignment.group,
-                    **log_params,
-                )
-                continue
+                for assignment_fn, assignments in assignment_tasks
+                for assignment in assignments
+            ]
+        )
 
     return response
 
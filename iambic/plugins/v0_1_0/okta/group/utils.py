@@ -465,12 +465,14 @@ async def update_group_members(
     response = []
     current_user_usernames = [user.username for user in group.members]
     desired_user_usernames = [user.username for user in new_members]
+    current_user_username_set = set(current_user_usernames)
+    desired_user_username_set = set(desired_user_usernames)
     users_to_remove = [
-        user for user in current_user_usernames if user not in desired_user_usernames
+        user for user in current_user_usernames if user not in desired_user_username_set
     ]
 
     users_to_add = [
-        user for user in desired_user_usernames if user not in current_user_usernames
+        user for user in desired_user_usernames if user not in current_user_username_set
     ]
 
     if users_to_remove:
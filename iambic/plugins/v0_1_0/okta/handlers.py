@@ -28,6 +28,10 @@ async def load(config: OktaConfig) -> OktaConfig:
     return config
 
 
+async def teardown(config: OktaConfig):
+    await asyncio.gather(*[org.close() for org in config.organizations])
+
+
 async def import_okta_resources(
     exe_message: ExecutionMessage,
     config: OktaConfig,
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Optional
 
+import aiohttp
 from okta.client import Client as OktaClient
-from pydantic import BaseModel, Extra, Field, SecretStr, validator
+from pydantic import BaseModel, Extra, Field, PrivateAttr, SecretStr, validator
 
 from iambic.core.iambic_enum import IambicManaged
 from iambic.core.iambic_plugin import ProviderPlugin
 from iambic.core.models import ConfigMixin
 from iambic.plugins.v0_1_0 import PLUGIN_VERSION
-from iambic.plugins.v0_1_0.okta.handlers import import_okta_resources, load
+from iambic.plugins.v0_1_0.okta.handlers import import_okta_resources, load, teardown
 
 
 def get_okta_templates():
@@ -24,6 +26,11 @@ def get_okta_templates():
     ]
 
 
+# Sized to the largest NoqSemaphore used against Okta so concurrent requests reuse connections
+OKTA_CONNECTION_POOL_SIZE = 75
+OKTA_KEEPALIVE_TIMEOUT = 60
+
+
 class OktaOrganization(BaseModel):
     idp_name: str
     org_url: str
@@ -34,12 +41,20 @@ class OktaOrganization(BaseModel):
         IambicManaged.UNDEFINED,
         description="Controls the directionality of iambic changes",
     )
+    _client_loop: Any = PrivateAttr(None)
+    _session: Any = PrivateAttr(None)
 
     class Config:
         arbitrary_types_allowed = True
         extra = Extra.forbid
 
     async def get_okta_client(self) -> OktaClient:
+        loop = asyncio.get_running_loop()
+        if self.client and self._client_loop not in (None, loop):
+            # The pooled session is bound to the event loop it was created on
+            self.client = None
+            self._session = None
+
         if not self.client:
             self.client = OktaClient(
                 {
@@ -49,8 +64,34 @@ class OktaOrganization(BaseModel):
                     "rateLimit": {"maxRetries": 0},
                 }
             )
+            # Without a session the SDK opens a new connection, and TLS handshake, per request
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=OKTA_CONNECTION_POOL_SIZE,
+                    keepalive_timeout=OKTA_KEEPALIVE_TIMEOUT,
+                )
+            )
+            self.client.get_request_executor().set_session(session)
+            self._session = session
+            self._client_loop = loop
         return self.client
 
+    async def close(self):
+        """
+        Close the pooled session of the Okta client, if one was created.
+
+        Must be awaited on the event loop that created the client,
+        the next call to get_okta_client creates a new one.
+        """
+        if not self._session:
+            return
+
+        if self._client_loop is asyncio.get_running_loop():
+            await self._session.close()
+        self.client = None
+        self._session = None
+        self._client_loop = None
+
 
 class OktaConfig(ConfigMixin, BaseModel):
     organizations: list[OktaOrganization] = Field(
@@ -89,5 +130,6 @@ IAMBIC_PLUGIN = ProviderPlugin(
     requires_secret=True,
     async_import_callable=import_okta_resources,
     async_load_callable=load,
+    async_teardown_callable=teardown,
     templates=get_okta_templates(),
 )
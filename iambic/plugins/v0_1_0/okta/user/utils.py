@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import asyncio
 import functools
-from typing import TYPE_CHECKING, Any, List, Optional
+from enum import Enum
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, List, Mapping, Optional
 
 import okta.models as models
 
@@ -20,6 +22,36 @@ if TYPE_CHECKING:
     from iambic.plugins.v0_1_0.okta.user.models import OktaUserTemplate
 
 
+def _normalize_user_status(status) -> Optional[str]:
+    """
+    User statuses arrive as iambic UserStatus members, Okta SDK UserStatus members
+    or plain strings, and Okta uses upper case where iambic uses lower case.
+    """
+    if isinstance(status, Enum):
+        status = status.value
+    return status.lower() if status else None
+
+
+# Maps a (current, new) status pair to the method and endpoint of the lifecycle operation.
+# A current status of "*" is the fallback for any status without a more specific entry.
+_USER_STATUS_TRANSITIONS: Mapping[tuple[str, str], tuple[str, str]] = MappingProxyType(
+    {
+        ("suspended", "active"): ("POST", "/lifecycle/unsuspend"),
+        ("active", "suspended"): ("POST", "/lifecycle/suspend"),
+        ("staged", "active"): ("POST", "/lifecycle/activate"),
+        ("staged", "provisioned"): ("POST", "/lifecycle/activate"),
+        ("deprovisioned", "active"): ("POST", "/lifecycle/activate"),
+        ("deprovisioned", "provisioned"): ("POST", "/lifecycle/activate"),
+        ("provisioned", "active"): ("POST", "/lifecycle/reactivate"),
+        ("locked_out", "active"): ("POST", "/lifecycle/unlock"),
+        ("*", "deprovisioned"): ("POST", "/lifecycle/deactivate"),
+        ("*", "recovery"): ("POST", "/lifecycle/reset_password"),
+        ("*", "password_expired"): ("POST", "/lifecycle/expire_password"),
+        ("*", "deleted"): ("DELETE", ""),
+    }
+)
+
+
 async def create_user(
     user_template: OktaUserTemplate,
     okta_organization: OktaOrganization,
@@ -37,14 +69,13 @@ async def create_user(
     """
 
     # TODO: Need ProposedChanges, support context.execute = False
-    client = await okta_organization.get_okta_client()
-
     user_model = {
         "profile": user_template.properties.profile,
     }
 
     # Create the user
     if ctx.execute:
+        client = await okta_organization.get_okta_client()
         async with GlobalRetryController(
             fn_identifier="okta.create_user"
         ) as retry_controller:
@@ -125,10 +156,9 @@ async def change_user_status(
         List[ProposedChange]: A list of proposed changes to be applied.
     """
 
-    client = await okta_organization.get_okta_client()
     response: list = []
 
-    if user.status == new_status:
+    if _normalize_user_status(user.status) == _normalize_user_status(new_status):
         return response
 
     if user.status:
@@ -148,6 +178,7 @@ async def change_user_status(
     )
 
     if ctx.execute:
+        client = await okta_organization.get_okta_client()
         async with GlobalRetryController(
             fn_identifier="okta.update_user"
         ) as retry_controller:
@@ -250,13 +281,12 @@ async def update_user_status(
         List[ProposedChange]: A list of proposed changes to be applied.
     """
     response: list = []
-    if not user:
+    if not user or user.deleted:
         return response
+    new_status = _normalize_user_status(new_status)
     current_status: str = user.status.value
     if current_status == new_status:
         return response
-    if user.deleted:
-        return response
 
     response.append(
         ProposedChange(
@@ -273,32 +303,10 @@ async def update_user_status(
         )
     )
 
-    # TODO: refactor to use an state machine approach
-    method = "POST"
-    base_endpoint = f"/api/v1/users/{user.user_id}"
-    if current_status == "suspended" and new_status == "active":
-        api_endpoint = f"{base_endpoint}/lifecycle/unsuspend"
-    elif current_status == "active" and new_status == "suspended":
-        api_endpoint = f"{base_endpoint}/lifecycle/suspend"
-    elif new_status == "deprovisioned" and current_status != "deprovisioned":
-        api_endpoint = f"{base_endpoint}/lifecycle/deactivate"
-    elif current_status in ["staged", "deprovisioned"] and new_status in [
-        "active",
-        "provisioned",
-    ]:
-        api_endpoint = f"{base_endpoint}/lifecycle/activate"
-    elif current_status in "provisioned" and new_status == "active":
-        api_endpoint = f"{base_endpoint}/lifecycle/reactivate"
-    elif current_status == "locked_out" and new_status == "active":
-        api_endpoint = f"{base_endpoint}/lifecycle/unlock"
-    elif new_status == "recovery":
-        api_endpoint = f"{base_endpoint}/lifecycle/reset_password"
-    elif new_status == "password_expired":
-        api_endpoint = f"{base_endpoint}/lifecycle/expire_password"
-    elif new_status == "deleted":
-        api_endpoint = f"{base_endpoint}"
-        method = "DELETE"
-    else:
+    route = _USER_STATUS_TRANSITIONS.get(
+        (current_status, new_status)
+    ) or _USER_STATUS_TRANSITIONS.get(("*", new_status))
+    if not route:
         log.error(
             "Error updating user status",
             user=user.username,
@@ -309,6 +317,8 @@ async def update_user_status(
         raise Exception(
             f"Error updating user status. Invalid transition from {current_status} to {new_status}"
         )
+    method, endpoint_suffix = route
+    api_endpoint = f"/api/v1/users/{user.user_id}{endpoint_suffix}"
 
     if ctx.execute:
         client = await okta_organization.get_okta_client()
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import asyncio
 import json
+import time
+from typing import Optional
 
 import okta.models as models
 from okta.errors.okta_api_error import OktaAPIError
 
 from iambic.core.exceptions import RateLimitException
+from iambic.core.logger import log
 from iambic.plugins.v0_1_0.okta.exceptions import UserProfileNotUpdatableYet
 
 
@@ -18,12 +21,87 @@ async def generate_user_profile(user: models.User):
     return {k: v for (k, v) in user.profile.__dict__.items() if v is not None}
 
 
+# Okta rate limits are scoped per org and endpoint.
+# The client's base url stands in for the org and the SDK method for the endpoint.
+# Maps (org url, method name) to the remaining budget and the epoch second it resets.
+OKTA_RATE_LIMIT_STORAGE: dict[tuple[Optional[str], str], tuple[int, float]] = {}
+# Once an endpoint is this close to its limit, hold new requests until the window resets
+OKTA_RATE_LIMIT_LOW_WATER_MARK = 5
+
+
+def _get_rate_limit_header(headers, name: str) -> Optional[float]:
+    value = headers.get(name) or headers.get(name.lower())
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_rate_limit_key(fn) -> Optional[tuple[Optional[str], str]]:
+    fn = getattr(fn, "func", fn)
+    if not (endpoint := getattr(fn, "__name__", None)):
+        return None
+
+    org_url = None
+    client = getattr(fn, "__self__", None)
+    if hasattr(client, "get_base_url"):
+        org_url = client.get_base_url()
+    return org_url, endpoint
+
+
+def record_okta_rate_limit(key: tuple[Optional[str], str], res):
+    """
+    Store the rate limit state Okta advertises in the response headers of an SDK call.
+    """
+    for elem in res or []:
+        if not hasattr(elem, "get_headers"):
+            continue
+        headers = elem.get_headers() or {}
+        remaining = _get_rate_limit_header(headers, "X-Rate-Limit-Remaining")
+        reset = _get_rate_limit_header(headers, "X-Rate-Limit-Reset")
+        if remaining is not None and reset is not None:
+            OKTA_RATE_LIMIT_STORAGE[key] = (int(remaining), reset)
+        return
+
+
+async def wait_for_okta_rate_limit(key: tuple[Optional[str], str]):
+    """
+    Pace requests to an endpoint that is about to exhaust its rate limit.
+
+    Waiting out the remainder of the window is far cheaper than hitting the limit,
+    which Okta penalizes with a back-off that is applied to every caller.
+    """
+    if not (rate_limit := OKTA_RATE_LIMIT_STORAGE.get(key)):
+        return
+
+    remaining, reset = rate_limit
+    wait_time = reset - time.time()
+    if wait_time <= 0:
+        del OKTA_RATE_LIMIT_STORAGE[key]
+    elif remaining <= OKTA_RATE_LIMIT_LOW_WATER_MARK:
+        log.debug(
+            "Okta rate limit nearly exhausted. Waiting for it to reset.",
+            org_url=key[0],
+            endpoint=key[1],
+            remaining=remaining,
+            wait_time=wait_time,
+        )
+        await asyncio.sleep(wait_time)
+
+
 async def handle_okta_fn(fn, *args, **kwargs):
+    rate_limit_key = _get_rate_limit_key(fn)
+    if rate_limit_key:
+        await wait_for_okta_rate_limit(rate_limit_key)
+
     try:
         res = await fn(*args, **kwargs)
     except asyncio.exceptions.TimeoutError:
         raise asyncio.exceptions.TimeoutError
 
+    if rate_limit_key:
+        record_okta_rate_limit(rate_limit_key, res)
+
     err = res[-1]
     if err:
         if isinstance(err, Exception):
@@ -67,3 +67,15 @@ def eval_only_context():
 def test_evaluate_on_account(eval_only_context, resource, aws_account, expected_value):
     value = evaluate_on_provider(resource, aws_account)
     assert value == expected_value
+
+
+def test_evaluate_on_account_after_rules_change(eval_only_context):
+    resource = template_cls(file_path="/dev/null", **template_dict)
+    aws_account = AWSAccount(account_id="123456789012", account_name="staging")
+    assert evaluate_on_provider(resource, aws_account) is False
+
+    # the memoized result must follow the rules when they are edited in place
+    resource.included_accounts.append("staging")
+    assert evaluate_on_provider(resource, aws_account) is True
+    resource.excluded_accounts = ["staging"]
+    assert evaluate_on_provider(resource, aws_account) is False
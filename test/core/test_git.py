@@ -18,6 +18,7 @@ import iambic.plugins.v0_1_0.example
 from iambic.config.dynamic_config import load_config
 from iambic.core.git import (
     GitDiff,
+    clone_git_repo,
     clone_git_repos,
     create_templates_for_deleted_files,
     create_templates_for_modified_files,
@@ -329,6 +330,18 @@ async def test_clone_git_repos(test_config, os_path: None, mocked_repo: MagicMoc
             assert mock_clone_from.call_count == 2
 
 
+def test_clone_git_repo_with_depth():
+    with patch.object(iambic.core.git.Repo, "clone_from") as mock_clone_from:
+        clone_git_repo("https://github.com/user/repo1.git", "repo1", "main", depth=1)
+        mock_clone_from.assert_called_once_with(
+            "https://github.com/user/repo1.git",
+            "repo1",
+            branch="main",
+            depth=1,
+            single_branch=True,
+        )
+
+
 @pytest.mark.asyncio
 async def test_clone_git_repos_with_git_error(
     test_config, os_path: None, mocked_repo: MagicMock
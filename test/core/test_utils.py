@@ -3,20 +3,30 @@ from __future__ import annotations
 import asyncio
 import unittest
 from datetime import date, datetime, timezone
-from typing import List
+from typing import Any, List
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from deepdiff import DeepDiff
 from stringcase import pascalcase, snakecase
 
+from iambic.core import noq_json as json
 from iambic.core.models import BaseModel
 from iambic.core.utils import (
     GlobalRetryController,
+    NoqSemaphore,
+    aio_wrapper,
+    camel_to_kebab,
+    camel_to_snake,
     convert_between_json_and_yaml,
     create_commented_map,
+    deep_diff_to_dict,
     evaluate_on_provider,
+    is_regex_match,
     normalize_dict_keys,
+    remove_expired_resources,
     simplify_dt,
+    snake_to_camelback,
     sort_dict,
     transform_comments,
     yaml,
@@ -399,6 +409,126 @@ def test_normalize_dict_keys():
     assert result == expected_result
 
 
+def test_normalize_dict_keys_with_skipped_keys():
+    data = {
+        "Condition": {"StringEquals": {"aws:PrincipalTag/Team": "x"}},
+        "Statement": [{"Effect": "Allow", "Action": ["s3:GetObject"]}, "Raw"],
+    }
+    assert normalize_dict_keys(data) == {
+        "condition": {"StringEquals": {"aws:PrincipalTag/Team": "x"}},
+        "statement": [{"effect": "Allow", "action": ["s3:GetObject"]}, "Raw"],
+    }
+
+
+@pytest.mark.parametrize(
+    "str_obj, snake, kebab",
+    [
+        ("PolicyDocument", "policy_document", "policy-document"),
+        ("RoleId", "role_id", "role-id"),
+        ("S3Bucket", "s3_bucket", "s3-bucket"),
+    ],
+)
+def test_case_conversions(str_obj, snake, kebab):
+    assert camel_to_snake(str_obj) == snake
+    # the cached result is returned on repeat calls
+    assert camel_to_snake(str_obj) == snake
+    assert camel_to_kebab(str_obj) == kebab
+    assert snake_to_camelback(snake) == str_obj[0].lower() + str_obj[1:]
+
+
+@pytest.mark.parametrize(
+    "regex, test_string, expected",
+    [
+        ("dev-*", "dev-account", True),
+        ("dev-*", "dev", False),
+        ("DEV-*", "dev-account", True),
+        ("prod", "prod", True),
+        ("prod", "production", False),
+        ("bad[*", "bad[*", True),
+        ("bad[*", "bad[x", False),
+    ],
+)
+def test_is_regex_match(regex, test_string, expected):
+    assert is_regex_match(regex, test_string) is expected
+    # the compiled rule is reused on repeat calls
+    assert is_regex_match(regex, test_string) is expected
+
+
+def test_remove_expired_resources():
+    from iambic.plugins.v0_1_0.aws.iam.role.models import AwsIamRoleTemplate
+
+    template = AwsIamRoleTemplate(
+        file_path="/dev/null",
+        identifier="example_role",
+        properties={
+            "role_name": "example_role",
+            "tags": [
+                {"key": "expired", "value": "x", "expires_at": "2000-01-01"},
+                {"key": "also_expired", "value": "x", "expires_at": "2000-01-01"},
+                {"key": "current", "value": "y"},
+            ],
+        },
+    )
+    result = remove_expired_resources(
+        template, template.resource_type, template.resource_id
+    )
+    assert result is template
+    assert [tag.key for tag in template.properties.tags] == ["current"]
+
+
+def test_remove_expired_resources_walks_any_fields():
+    from iambic.plugins.v0_1_0.aws.models import Tag
+
+    class Wrapper(BaseModel):
+        payload: Any = None
+
+        @property
+        def resource_type(self):
+            return "wrapper"
+
+        @property
+        def resource_id(self):
+            return "example"
+
+    wrapper = Wrapper(
+        payload=Tag(key="expired", value="x", expires_at="2000-01-01"),
+    )
+    remove_expired_resources(wrapper, "wrapper", "example")
+    assert wrapper.payload is None
+
+
+@pytest.mark.asyncio
+async def test_noq_semaphore_process():
+    running = 0
+    max_running = 0
+
+    async def double(value):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0)
+        running -= 1
+        if value < 0:
+            raise ValueError(value)
+        return value * 2
+
+    semaphore = NoqSemaphore(double, 3)
+    assert await semaphore.process([{"value": v} for v in range(10)]) == [
+        v * 2 for v in range(10)
+    ]
+    assert max_running == 3
+    assert await semaphore.process([]) == []
+
+    results = await semaphore.process(
+        [{"value": 1}, {"value": -1}, {"value": 2}], return_exceptions=True
+    )
+    assert results[0] == 2
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 4
+    with pytest.raises(ValueError):
+        await semaphore.process([{"value": -1}])
+
+
 def test_convert_between_json_and_yaml():
     # Test converting JSON to YAML
     json_input = '{"MyKey": {"InnerKey": "value"}}'
@@ -420,3 +550,30 @@ def test_evaluate_on_provider_organization_account():
     provider_details.organization_account = True
 
     assert evaluate_on_provider(resource, provider_details)
+
+
+def test_deep_diff_to_dict():
+    diff = DeepDiff(
+        {"Version": 1, "Statement": [{"Action": "s3:GetObject"}], "Ids": {1, 2}},
+        {"Version": "1", "Statement": [{"Action": "s3:*"}], "Ids": {3}},
+        ignore_order=True,
+        report_repetition=True,
+    )
+    assert deep_diff_to_dict(diff) == json.loads(diff.to_json())
+    assert deep_diff_to_dict(diff)["type_changes"]["root['Version']"]["old_type"] == (
+        "int"
+    )
+
+
+@pytest.mark.asyncio
+async def test_aio_wrapper():
+    def add(x, y=0):
+        return x + y
+
+    assert await aio_wrapper(add, 1, y=2) == 3
+
+    async def async_add(x, y=0):
+        return x + y
+
+    with pytest.raises(TypeError):
+        await aio_wrapper(async_add, 1)
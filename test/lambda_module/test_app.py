@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import tempfile
+from unittest.mock import patch
 
 import pytest
 
@@ -37,3 +38,13 @@ def test_init_repo_base_path_inside_of_lambda(mock_aws_lambda_function_name):
     assert new_repo_base_path.startswith(tempfile.gettempdir())
     assert old_repo_base_path != new_repo_base_path
     assert os.path.exists(new_repo_base_path)
+
+
+def test_run_handler_dispatch():
+    app = getattr(iambic_module, "lambda").app
+    with patch("iambic.lambda.app.run_detect") as mock_run_detect:
+        app.run_handler(None, {"command": "detect"})
+        mock_run_detect.assert_called_once_with(app.REPO_BASE_PATH)
+
+    with pytest.raises(NotImplementedError):
+        app.run_handler(None, {"command": "unknown"})
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import boto3
+import pytest
+from moto import mock_iam
+
+
+@pytest.fixture(scope="module")
+def mock_iam_backend():
+    # Starting the moto IAM backend dominates the per test cost,
+    # so each test module shares one and its mock_iam_client fixture
+    # recreates the resource under test for every test.
+    with mock_iam():
+        yield boto3.client("iam")
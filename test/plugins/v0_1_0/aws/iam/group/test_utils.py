@@ -1,10 +1,9 @@
 from __future__ import annotations
 
+import copy
 import json
 
-import boto3
 import pytest
-from moto import mock_iam
 
 from iambic.core.models import ProposedChangeType
 from iambic.plugins.v0_1_0.aws.iam.group.utils import (
@@ -34,25 +33,51 @@ EXAMPLE_INLINE_POLICY_DOCUMENT = """
    ]
 }
 """
+EXAMPLE_INLINE_POLICY = json.loads(EXAMPLE_INLINE_POLICY_DOCUMENT)
 EXAMPLE_MANAGED_POLICY_ARN = "arn:aws:iam::aws:policy/job-function/ViewOnlyAccess"
 
 
-@pytest.fixture
-def mock_iam_client():
-    with mock_iam():
-        iam_client = boto3.client("iam")
-        _ = iam_client.create_group(
-            GroupName=EXAMPLE_GROUPNAME,
+def delete_example_group(iam_client):
+    try:
+        group = iam_client.get_group(GroupName=EXAMPLE_GROUPNAME)
+    except iam_client.exceptions.NoSuchEntityException:
+        return
+
+    for user in group["Users"]:
+        iam_client.remove_user_from_group(
+            GroupName=EXAMPLE_GROUPNAME, UserName=user["UserName"]
         )
-        _ = iam_client.put_group_policy(
-            GroupName=EXAMPLE_GROUPNAME,
-            PolicyName=EXAMPLE_INLINE_POLICY_NAME,
-            PolicyDocument=EXAMPLE_INLINE_POLICY_DOCUMENT,
+    for policy in iam_client.list_attached_group_policies(GroupName=EXAMPLE_GROUPNAME)[
+        "AttachedPolicies"
+    ]:
+        iam_client.detach_group_policy(
+            GroupName=EXAMPLE_GROUPNAME, PolicyArn=policy["PolicyArn"]
         )
-        _ = iam_client.attach_group_policy(
-            GroupName=EXAMPLE_GROUPNAME, PolicyArn=EXAMPLE_MANAGED_POLICY_ARN
+    for policy_name in iam_client.list_group_policies(GroupName=EXAMPLE_GROUPNAME)[
+        "PolicyNames"
+    ]:
+        iam_client.delete_group_policy(
+            GroupName=EXAMPLE_GROUPNAME, PolicyName=policy_name
         )
-        yield iam_client
+    iam_client.delete_group(GroupName=EXAMPLE_GROUPNAME)
+
+
+@pytest.fixture
+def mock_iam_client(mock_iam_backend):
+    iam_client = mock_iam_backend
+    _ = iam_client.create_group(
+        GroupName=EXAMPLE_GROUPNAME,
+    )
+    _ = iam_client.put_group_policy(
+        GroupName=EXAMPLE_GROUPNAME,
+        PolicyName=EXAMPLE_INLINE_POLICY_NAME,
+        PolicyDocument=EXAMPLE_INLINE_POLICY_DOCUMENT,
+    )
+    _ = iam_client.attach_group_policy(
+        GroupName=EXAMPLE_GROUPNAME, PolicyArn=EXAMPLE_MANAGED_POLICY_ARN
+    )
+    yield iam_client
+    delete_example_group(iam_client)
 
 
 @pytest.mark.asyncio
@@ -87,7 +112,7 @@ async def test_get_group_inline_policies(mock_iam_client):
         EXAMPLE_GROUPNAME, mock_iam_client
     )
     assert len(inline_policies) == 1
-    assert EXAMPLE_INLINE_POLICY_NAME in inline_policies.keys()
+    assert EXAMPLE_INLINE_POLICY_NAME in inline_policies
 
     inline_policies = await get_group_inline_policies(
         EXAMPLE_GROUPNAME, mock_iam_client, as_dict=False
@@ -137,7 +162,7 @@ async def test_apply_group_managed_policies_on_detach(mock_iam_client):
 @pytest.mark.asyncio
 async def test_apply_group_inline_policies_on_attach(mock_iam_client):
     template_policies = [{"PolicyName": EXAMPLE_INLINE_POLICY_NAME}]
-    template_policies[0].update(json.loads(EXAMPLE_INLINE_POLICY_DOCUMENT))
+    template_policies[0].update(copy.deepcopy(EXAMPLE_INLINE_POLICY))
     existing_policies = []
     log_params = {}
     proposed_changes = await apply_group_inline_policies(
@@ -154,7 +179,7 @@ async def test_apply_group_inline_policies_on_attach(mock_iam_client):
 async def test_apply_group_inline_policies_on_detach(mock_iam_client):
     template_policies = []
     existing_policies = [{"PolicyName": EXAMPLE_INLINE_POLICY_NAME}]
-    existing_policies[0].update(json.loads(EXAMPLE_INLINE_POLICY_DOCUMENT))
+    existing_policies[0].update(copy.deepcopy(EXAMPLE_INLINE_POLICY))
     log_params = {}
     proposed_changes = await apply_group_inline_policies(
         EXAMPLE_GROUPNAME,
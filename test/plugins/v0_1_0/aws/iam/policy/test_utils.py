@@ -2,9 +2,7 @@ from __future__ import annotations
 
 import json
 
-import boto3
 import pytest
-from moto import mock_iam
 
 from iambic.core.models import ProposedChangeType
 from iambic.plugins.v0_1_0.aws.iam.policy.utils import (
@@ -48,21 +46,37 @@ EXAMPLE_TAG_VALUE = "test_value"
 EXAMPLE_POLICY_ARN = "arn:aws:iam::123456789012:policy/example_managed_policy_name"
 
 
+def delete_example_policy(iam_client):
+    try:
+        iam_client.get_policy(PolicyArn=EXAMPLE_POLICY_ARN)
+    except iam_client.exceptions.NoSuchEntityException:
+        return
+
+    for version in iam_client.list_policy_versions(PolicyArn=EXAMPLE_POLICY_ARN)[
+        "Versions"
+    ]:
+        if not version["IsDefaultVersion"]:
+            iam_client.delete_policy_version(
+                PolicyArn=EXAMPLE_POLICY_ARN, VersionId=version["VersionId"]
+            )
+    iam_client.delete_policy(PolicyArn=EXAMPLE_POLICY_ARN)
+
+
 @pytest.fixture
-def mock_iam_client():
-    with mock_iam():
-        iam_client = boto3.client("iam")
-        _ = iam_client.create_policy(
-            PolicyName=EXAMPLE_MANAGED_POLICY_NAME,
-            PolicyDocument=EXAMPLE_POLICY_DOCUMENT,
-            Tags=[
-                {
-                    "Key": EXAMPLE_TAG_KEY,
-                    "Value": EXAMPLE_TAG_VALUE,
-                }
-            ],
-        )
-        yield iam_client
+def mock_iam_client(mock_iam_backend):
+    iam_client = mock_iam_backend
+    _ = iam_client.create_policy(
+        PolicyName=EXAMPLE_MANAGED_POLICY_NAME,
+        PolicyDocument=EXAMPLE_POLICY_DOCUMENT,
+        Tags=[
+            {
+                "Key": EXAMPLE_TAG_KEY,
+                "Value": EXAMPLE_TAG_VALUE,
+            }
+        ],
+    )
+    yield iam_client
+    delete_example_policy(iam_client)
 
 
 @pytest.mark.asyncio
@@ -116,6 +130,8 @@ async def test_managed_policies(mock_iam_client):
     policies = await list_managed_policies(mock_iam_client)
     assert len(policies) == 1
     assert policies[0]["PolicyName"] == EXAMPLE_MANAGED_POLICY_NAME
+    assert policies[0]["PolicyDocument"] == json.loads(EXAMPLE_POLICY_DOCUMENT)
+    assert "DefaultVersionId" not in policies[0]
 
 
 @pytest.mark.asyncio
@@ -138,6 +154,20 @@ async def test_apply_update_managed_policy(mock_iam_client):
     assert proposed_changes[0].change_type == ProposedChangeType.UPDATE
 
 
+@pytest.mark.asyncio
+async def test_apply_update_managed_policy_with_no_changes(mock_iam_client):
+    template_policy_document = json.loads(EXAMPLE_POLICY_DOCUMENT)
+    log_params = {}
+    proposed_changes = await apply_update_managed_policy(
+        mock_iam_client,
+        EXAMPLE_POLICY_ARN,
+        template_policy_document,
+        EXAMPLE_POLICY_DOCUMENT,
+        log_params,
+    )
+    assert proposed_changes == []
+
+
 @pytest.mark.asyncio
 async def test_apply_update_managed_policy_using_legacy_syntax(mock_iam_client):
     template_policy_document = json.loads(EXAMPLE_LEGACY_POLICY_DOCUMENT)
@@ -181,3 +211,20 @@ async def test_apply_user_tags_on_attach(mock_iam_client):
         log_params,
     )
     assert proposed_changes[0].change_type == ProposedChangeType.ATTACH
+
+
+@pytest.mark.asyncio
+async def test_apply_user_tags_on_value_change(mock_iam_client):
+    template_tags = [{"Key": EXAMPLE_TAG_KEY, "Value": "new_value"}]
+    existing_tags = [{"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}]
+    log_params = {}
+    proposed_changes = await apply_managed_policy_tags(
+        mock_iam_client,
+        EXAMPLE_POLICY_ARN,
+        template_tags,
+        existing_tags,
+        log_params,
+    )
+    assert len(proposed_changes) == 1
+    assert proposed_changes[0].change_type == ProposedChangeType.ATTACH
+    assert proposed_changes[0].new_value == template_tags[0]
@@ -1,11 +1,10 @@
 from __future__ import annotations
 
+import copy
 import json
 from typing import Any, Dict
 
-import boto3
 import pytest
-from moto import mock_iam
 
 from iambic.core.models import ProposedChangeType
 from iambic.plugins.v0_1_0.aws.iam.role.utils import (
@@ -55,9 +54,12 @@ EXAMPLE_INLINE_POLICY_DOCUMENT = """
    ]
 }
 """
+EXAMPLE_INLINE_POLICY = json.loads(EXAMPLE_INLINE_POLICY_DOCUMENT)
 EXAMPLE_TAG_KEY = "test_key"
 EXAMPLE_TAG_VALUE = "test_value"
 EXAMPLE_MANAGED_POLICY_ARN = "arn:aws:iam::aws:policy/job-function/ViewOnlyAccess"
+EXAMPLE_TAG = {"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}
+EXAMPLE_MANAGED_POLICY = {"PolicyArn": EXAMPLE_MANAGED_POLICY_ARN}
 
 
 class FakeIamClient(object):
@@ -86,9 +88,10 @@ class FakeIamClient(object):
         }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def iam_client():
     # until we can integration moto library, we are faking some iam methods
+    # FakeIamClient is stateless, so one instance serves the whole module
     return FakeIamClient()
 
 
@@ -98,29 +101,45 @@ async def test_list_roles(iam_client):
     assert len(roles) > 0
 
 
-@pytest.fixture
-def mock_iam_client():
-    with mock_iam():
-        iam_client = boto3.client("iam")
-        _ = iam_client.create_role(
-            RoleName=EXAMPLE_ROLE_NAME,
-            AssumeRolePolicyDocument=EXAMPLE_ASSUME_ROLE_DOCUMENT,
-            Tags=[
-                {
-                    "Key": EXAMPLE_TAG_KEY,
-                    "Value": EXAMPLE_TAG_VALUE,
-                }
-            ],
-        )
-        _ = iam_client.put_role_policy(
-            RoleName=EXAMPLE_ROLE_NAME,
-            PolicyName=EXAMPLE_INLINE_POLICY_NAME,
-            PolicyDocument=EXAMPLE_INLINE_POLICY_DOCUMENT,
+def delete_example_role(iam_client):
+    try:
+        iam_client.get_role(RoleName=EXAMPLE_ROLE_NAME)
+    except iam_client.exceptions.NoSuchEntityException:
+        return
+
+    for policy in iam_client.list_attached_role_policies(RoleName=EXAMPLE_ROLE_NAME)[
+        "AttachedPolicies"
+    ]:
+        iam_client.detach_role_policy(
+            RoleName=EXAMPLE_ROLE_NAME, PolicyArn=policy["PolicyArn"]
         )
-        _ = iam_client.attach_role_policy(
-            RoleName=EXAMPLE_ROLE_NAME, PolicyArn=EXAMPLE_MANAGED_POLICY_ARN
+    for policy_name in iam_client.list_role_policies(RoleName=EXAMPLE_ROLE_NAME)[
+        "PolicyNames"
+    ]:
+        iam_client.delete_role_policy(
+            RoleName=EXAMPLE_ROLE_NAME, PolicyName=policy_name
         )
-        yield iam_client
+    iam_client.delete_role(RoleName=EXAMPLE_ROLE_NAME)
+
+
+@pytest.fixture
+def mock_iam_client(mock_iam_backend):
+    iam_client = mock_iam_backend
+    _ = iam_client.create_role(
+        RoleName=EXAMPLE_ROLE_NAME,
+        AssumeRolePolicyDocument=EXAMPLE_ASSUME_ROLE_DOCUMENT,
+        Tags=[EXAMPLE_TAG],
+    )
+    _ = iam_client.put_role_policy(
+        RoleName=EXAMPLE_ROLE_NAME,
+        PolicyName=EXAMPLE_INLINE_POLICY_NAME,
+        PolicyDocument=EXAMPLE_INLINE_POLICY_DOCUMENT,
+    )
+    _ = iam_client.attach_role_policy(
+        RoleName=EXAMPLE_ROLE_NAME, PolicyArn=EXAMPLE_MANAGED_POLICY_ARN
+    )
+    yield iam_client
+    delete_example_role(iam_client)
 
 
 @pytest.mark.asyncio
@@ -138,7 +157,7 @@ async def test_get_role_instance_profiles(mock_iam_client):
 @pytest.mark.asyncio
 async def test_list_role_tags(mock_iam_client):
     tags = await list_role_tags(EXAMPLE_ROLE_NAME, mock_iam_client)
-    assert tags == [{"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}]
+    assert tags == [EXAMPLE_TAG]
 
 
 @pytest.mark.asyncio
@@ -153,7 +172,7 @@ async def test_get_role_policy(mock_iam_client):
 async def test_get_role_inline_policies(mock_iam_client):
     inline_policies = await get_role_inline_policies(EXAMPLE_ROLE_NAME, mock_iam_client)
     assert len(inline_policies) == 1
-    assert EXAMPLE_INLINE_POLICY_NAME in inline_policies.keys()
+    assert EXAMPLE_INLINE_POLICY_NAME in inline_policies
 
     inline_policies = await get_role_inline_policies(
         EXAMPLE_ROLE_NAME, mock_iam_client, as_dict=False
@@ -174,7 +193,7 @@ async def test_get_role_managed_policies(mock_iam_client):
 async def test_get_role(mock_iam_client):
     role = await get_role(EXAMPLE_ROLE_NAME, mock_iam_client)
     assert role["RoleName"] == EXAMPLE_ROLE_NAME
-    assert role["Tags"] == [{"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}]
+    assert role["Tags"] == [EXAMPLE_TAG]
 
     # Remove the tags from the role and check that this is able to return the Tag dict as empty
     mock_iam_client.untag_role(RoleName=EXAMPLE_ROLE_NAME, TagKeys=[EXAMPLE_TAG_KEY])
@@ -185,127 +204,106 @@ async def test_get_role(mock_iam_client):
 
 
 @pytest.mark.asyncio
-async def test_apply_role_tags_on_detach(mock_iam_client):
-    template_tags = []
-    existing_tags = [{"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}]
-    log_params = {}
-    proposed_changes = await apply_role_tags(
-        EXAMPLE_ROLE_NAME,
-        mock_iam_client,
-        template_tags,
-        existing_tags,
-        log_params,
-    )
-    assert proposed_changes[0].change_type == ProposedChangeType.DETACH
-
-
-@pytest.mark.asyncio
-async def test_apply_role_tags_on_attach(mock_iam_client):
-    template_tags = [{"Key": EXAMPLE_TAG_KEY, "Value": EXAMPLE_TAG_VALUE}]
-    existing_tags = []
-    log_params = {}
+@pytest.mark.parametrize(
+    "template_tags, existing_tags, expected_change_type",
+    [
+        ([], [EXAMPLE_TAG], ProposedChangeType.DETACH),
+        ([EXAMPLE_TAG], [], ProposedChangeType.ATTACH),
+    ],
+    ids=["detach", "attach"],
+)
+async def test_apply_role_tags(
+    mock_iam_client, template_tags, existing_tags, expected_change_type
+):
     proposed_changes = await apply_role_tags(
         EXAMPLE_ROLE_NAME,
         mock_iam_client,
         template_tags,
         existing_tags,
-        log_params,
-    )
-    assert proposed_changes[0].change_type == ProposedChangeType.ATTACH
-
-
-@pytest.mark.asyncio
-async def test_apply_role_managed_policies_on_attach(mock_iam_client):
-    template_policies = [{"PolicyArn": EXAMPLE_MANAGED_POLICY_ARN}]
-    existing_policies = []
-    log_params = {}
-    proposed_changes = await apply_role_managed_policies(
-        EXAMPLE_ROLE_NAME,
-        mock_iam_client,
-        template_policies,
-        existing_policies,
-        log_params,
+        {},
     )
-    assert proposed_changes[0].change_type == ProposedChangeType.ATTACH
+    assert proposed_changes[0].change_type == expected_change_type
 
 
 @pytest.mark.asyncio
-async def test_apply_role_managed_policies_on_detach(mock_iam_client):
-    template_policies = []
-    existing_policies = [{"PolicyArn": EXAMPLE_MANAGED_POLICY_ARN}]
-    log_params = {}
+@pytest.mark.parametrize(
+    "template_policies, existing_policies, expected_change_type",
+    [
+        ([EXAMPLE_MANAGED_POLICY], [], ProposedChangeType.ATTACH),
+        ([], [EXAMPLE_MANAGED_POLICY], ProposedChangeType.DETACH),
+    ],
+    ids=["attach", "detach"],
+)
+async def test_apply_role_managed_policies(
+    mock_iam_client, template_policies, existing_policies, expected_change_type
+):
     proposed_changes = await apply_role_managed_policies(
         EXAMPLE_ROLE_NAME,
         mock_iam_client,
         template_policies,
         existing_policies,
-        log_params,
-    )
-    assert proposed_changes[0].change_type == ProposedChangeType.DETACH
-
-
-@pytest.mark.asyncio
-async def test_apply_role_permission_boundary_on_attach(mock_iam_client):
-    template_permission_boundary = {"PolicyArn": EXAMPLE_MANAGED_POLICY_ARN}
-    existing_permission_boundary = {}
-    log_params = {}
-    proposed_changes = await apply_role_permission_boundary(
-        EXAMPLE_ROLE_NAME,
-        mock_iam_client,
-        template_permission_boundary,
-        existing_permission_boundary,
-        log_params,
+        {},
     )
-    assert proposed_changes[0].change_type == ProposedChangeType.ATTACH
+    assert proposed_changes[0].change_type == expected_change_type
 
 
 @pytest.mark.asyncio
-async def test_apply_role_permission_boundary_on_detach(mock_iam_client):
-    template_permission_boundary = {}
-    existing_permission_boundary = {
-        "PermissionsBoundaryArn": EXAMPLE_MANAGED_POLICY_ARN
-    }
-    log_params = {}
+@pytest.mark.parametrize(
+    "template_permission_boundary, existing_permission_boundary, expected_change_type",
+    [
+        (EXAMPLE_MANAGED_POLICY, {}, ProposedChangeType.ATTACH),
+        (
+            {},
+            {"PermissionsBoundaryArn": EXAMPLE_MANAGED_POLICY_ARN},
+            ProposedChangeType.DETACH,
+        ),
+    ],
+    ids=["attach", "detach"],
+)
+async def test_apply_role_permission_boundary(
+    mock_iam_client,
+    template_permission_boundary,
+    existing_permission_boundary,
+    expected_change_type,
+):
     proposed_changes = await apply_role_permission_boundary(
         EXAMPLE_ROLE_NAME,
         mock_iam_client,
         template_permission_boundary,
         existing_permission_boundary,
-        log_params,
-    )
-    assert proposed_changes[0].change_type == ProposedChangeType.DETACH
-
-
-@pytest.mark.asyncio
-async def test_apply_role_inline_policies_on_attach(mock_iam_client):
-    template_policies = [{"PolicyName": EXAMPLE_INLINE_POLICY_NAME}]
-    template_policies[0].update(json.loads(EXAMPLE_INLINE_POLICY_DOCUMENT))
-    existing_policies = []
-    log_params = {}
-    proposed_changes = await apply_role_inline_policies(
-        EXAMPLE_ROLE_NAME,
-        mock_iam_client,
-        template_policies,
-        existing_policies,
-        log_params,
+        {},
     )
-    assert proposed_changes[0].change_type == ProposedChangeType.CREATE
+    assert proposed_changes[0].change_type == expected_change_type
 
 
 @pytest.mark.asyncio
-async def test_apply_role_inline_policies_on_detach(mock_iam_client):
-    template_policies = []
-    existing_policies = [{"PolicyName": EXAMPLE_INLINE_POLICY_NAME}]
-    existing_policies[0].update(json.loads(EXAMPLE_INLINE_POLICY_DOCUMENT))
-    log_params = {}
+@pytest.mark.parametrize(
+    "template_policies, existing_policies, expected_change_type",
+    [
+        (
+            [{"PolicyName": EXAMPLE_INLINE_POLICY_NAME, **EXAMPLE_INLINE_POLICY}],
+            [],
+            ProposedChangeType.CREATE,
+        ),
+        (
+            [],
+            [{"PolicyName": EXAMPLE_INLINE_POLICY_NAME, **EXAMPLE_INLINE_POLICY}],
+            ProposedChangeType.DELETE,
+        ),
+    ],
+    ids=["attach", "detach"],
+)
+async def test_apply_role_inline_policies(
+    mock_iam_client, template_policies, existing_policies, expected_change_type
+):
     proposed_changes = await apply_role_inline_policies(
         EXAMPLE_ROLE_NAME,
         mock_iam_client,
-        template_policies,
-        existing_policies,
-        log_params,
+        copy.deepcopy(template_policies),
+        copy.deepcopy(existing_policies),
+        {},
     )
-    assert proposed_changes[0].change_type == ProposedChangeType.DELETE
+    assert proposed_changes[0].change_type == expected_change_type
 
 
 @pytest.mark.asyncio
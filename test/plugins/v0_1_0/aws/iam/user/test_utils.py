@@ -1,11 +1,10 @@
 from __future__ import annotations
 
+import copy
 import json
 from typing import Any, Dict
 
-import boto3
 import pytest
-from moto import mock_iam
 
 from iambic.core.models import ProposedChangeType
 from iambic.plugins.v0_1_0.aws.iam.user.utils import (
@@ -39,6 +38,7 @@ EXAMPLE_INLINE_POLICY_DOCUMENT = """
    ]
 }
 """
+EXAMPLE_INLINE_POLICY = json.loads(EXAMPLE_INLINE_POLICY_DOCUMENT)
 EXAMPLE_MANAGED_POLICY_ARN = "arn:aws:iam::aws:policy/job-function/ViewOnlyAccess"
 
 
@@ -68,9 +68,10 @@ class FakeIamClient(object):
         }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def iam_client():
     # until we can integration moto library, we are faking some iam methods
+    # FakeIamClient is stateless, so one instance serves the whole module
     return FakeIamClient()
 
 
@@ -80,28 +81,51 @@ async def test_list_users(iam_client):
     assert len(users) > 0
 
 
-@pytest.fixture
-def mock_iam_client():
-    with mock_iam():
-        iam_client = boto3.client("iam")
-        _ = iam_client.create_user(
-            UserName=EXAMPLE_USERNAME,
-            Tags=[
-                {
-                    "Key": EXAMPLE_TAG_KEY,
-                    "Value": EXAMPLE_TAG_VALUE,
-                }
-            ],
-        )
-        _ = iam_client.put_user_policy(
-            UserName=EXAMPLE_USERNAME,
-            PolicyName=EXAMPLE_INLINE_POLICY_NAME,
-            PolicyDocument=EXAMPLE_INLINE_POLICY_DOCUMENT,
+def delete_example_user(iam_client):
+    try:
+        iam_client.get_user(UserName=EXAMPLE_USERNAME)
+    except iam_client.exceptions.NoSuchEntityException:
+        return
+
+    for policy in iam_client.list_attached_user_policies(UserName=EXAMPLE_USERNAME)[
+        "AttachedPolicies"
+    ]:
+        iam_client.detach_user_policy(
+            UserName=EXAMPLE_USERNAME, PolicyArn=policy["PolicyArn"]
         )
-        _ = iam_client.attach_user_policy(
-            UserName=EXAMPLE_USERNAME, PolicyArn=EXAMPLE_MANAGED_POLICY_ARN
+    for policy_name in iam_client.list_user_policies(UserName=EXAMPLE_USERNAME)[
+        "PolicyNames"
+    ]:
+        iam_client.delete_user_policy(UserName=EXAMPLE_USERNAME, PolicyName=policy_name)
+    for group in iam_client.list_groups_for_user(UserName=EXAMPLE_USERNAME)["Groups"]:
+        iam_client.remove_user_from_group(
+            GroupName=group["GroupName"], UserName=EXAMPLE_USERNAME
         )
-        yield iam_client
+    iam_client.delete_user(UserName=EXAMPLE_USERNAME)
+
+
+@pytest.fixture
+def mock_iam_client(mock_iam_backend):
+    iam_client = mock_iam_backend
+    _ = iam_client.create_user(
+        UserName=EXAMPLE_USERNAME,
+        Tags=[
+            {
+                "Key": EXAMPLE_TAG_KEY,
+                "Value": EXAMPLE_TAG_VALUE,
+            }
+        ],
+    )
+    _ = iam_client.put_user_policy(
+        UserName=EXAMPLE_USERNAME,
+        PolicyName=EXAMPLE_INLINE_POLICY_NAME,
+        PolicyDocument=EXAMPLE_INLINE_POLICY_DOCUMENT,
+    )
+    _ = iam_client.attach_user_policy(
+        UserName=EXAMPLE_USERNAME, PolicyArn=EXAMPLE_MANAGED_POLICY_ARN
+    )
+    yield iam_client
+    delete_example_user(iam_client)
 
 
 @pytest.mark.asyncio
@@ -140,7 +164,7 @@ async def test_get_user_groups_2(mock_iam_client):
 async def test_user_user_inline_policies(mock_iam_client):
     inline_policies = await get_user_inline_policies(EXAMPLE_USERNAME, mock_iam_client)
     assert len(inline_policies) == 1
-    assert EXAMPLE_INLINE_POLICY_NAME in inline_policies.keys()
+    assert EXAMPLE_INLINE_POLICY_NAME in inline_policies
 
     inline_policies = await get_user_inline_policies(
         EXAMPLE_USERNAME, mock_iam_client, as_dict=False
@@ -252,7 +276,7 @@ async def test_apply_user_permission_boundary_on_detach(mock_iam_client):
 @pytest.mark.asyncio
 async def test_apply_user_inline_policies_on_attach(mock_iam_client):
     template_policies = [{"PolicyName": EXAMPLE_INLINE_POLICY_NAME}]
-    template_policies[0].update(json.loads(EXAMPLE_INLINE_POLICY_DOCUMENT))
+    template_policies[0].update(copy.deepcopy(EXAMPLE_INLINE_POLICY))
     existing_policies = []
     log_params = {}
     proposed_changes = await apply_user_inline_policies(
@@ -269,7 +293,7 @@ async def test_apply_user_inline_policies_on_attach(mock_iam_client):
 async def test_apply_user_inline_policies_on_detach(mock_iam_client):
     template_policies = []
     existing_policies = [{"PolicyName": EXAMPLE_INLINE_POLICY_NAME}]
-    existing_policies[0].update(json.loads(EXAMPLE_INLINE_POLICY_DOCUMENT))
+    existing_policies[0].update(copy.deepcopy(EXAMPLE_INLINE_POLICY))
     log_params = {}
     proposed_changes = await apply_user_inline_policies(
         EXAMPLE_USERNAME,
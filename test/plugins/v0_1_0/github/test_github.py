@@ -10,10 +10,14 @@ import github
 import pytest
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ec
+from git import Repo
 
 from iambic.core.utils import jws_encode_with_past_time
 from iambic.plugins.v0_1_0.github.github import (
     BODY_MAX_LENGTH,
+    GITHUB_CLIENT_PER_PAGE,
+    GITHUB_CLIENT_POOL_SIZE,
+    GITHUB_CLIENT_RETRY,
     MERGEABLE_STATE_BLOCKED,
     MERGEABLE_STATE_CLEAN,
     HandleIssueCommentReturnCode,
@@ -24,9 +28,16 @@ from iambic.plugins.v0_1_0.github.github import (
     handle_issue_comment,
     handle_pull_request,
     maybe_merge,
+    prepare_local_repo_for_new_commits,
 )
 from iambic.plugins.v0_1_0.github.iambic_plugin import GithubBotApprover
 
+GITHUB_CLIENT_KWARGS = {
+    "retry": GITHUB_CLIENT_RETRY,
+    "pool_size": GITHUB_CLIENT_POOL_SIZE,
+    "per_page": GITHUB_CLIENT_PER_PAGE,
+}
+
 
 @pytest.fixture
 def mock_github_client():
@@ -281,6 +292,77 @@ def test_format_github_url():
     assert url == expected_url
 
 
+def test_prepare_local_repo_for_new_commits_reuses_clone(tmp_path):
+    origin_path = tmp_path / "origin"
+    origin = Repo.init(origin_path, initial_branch="main")
+    (origin_path / "README.md").write_text("first")
+    origin.index.add(["README.md"])
+    origin.index.commit("first")
+
+    first_path = tmp_path / "first"
+    second_path = tmp_path / "second"
+    first_path.mkdir()
+    second_path.mkdir()
+    repo_url = str(origin_path)
+
+    with patch.dict(
+        "iambic.plugins.v0_1_0.github.github._LOCAL_REPO_PATH_CACHE", clear=True
+    ):
+        first_sha = prepare_local_repo_for_new_commits(
+            repo_url, str(first_path), "detect"
+        ).head.commit.hexsha
+        (first_path / "untracked.yaml").write_text("left over")
+
+        (origin_path / "README.md").write_text("second")
+        origin.index.add(["README.md"])
+        origin.index.commit("second")
+
+        with patch(
+            "iambic.plugins.v0_1_0.github.github.clone_git_repo"
+        ) as mock_clone_git_repo:
+            second_repo = prepare_local_repo_for_new_commits(
+                repo_url, str(second_path), "import"
+            )
+            mock_clone_git_repo.assert_not_called()
+
+    assert not first_path.exists()
+    assert second_repo.active_branch.name == "attempt/import"
+    assert second_repo.head.commit.hexsha != first_sha
+    assert (second_path / "README.md").read_text() == "second"
+    assert not (second_path / "untracked.yaml").exists()
+
+
+def test_prepare_local_repo_for_new_commits_clones_when_move_fails(tmp_path):
+    origin_path = tmp_path / "origin"
+    origin = Repo.init(origin_path, initial_branch="main")
+    (origin_path / "README.md").write_text("first")
+    origin.index.add(["README.md"])
+    origin.index.commit("first")
+
+    first_path = tmp_path / "first"
+    second_path = tmp_path / "second"
+    first_path.mkdir()
+    second_path.mkdir()
+    repo_url = str(origin_path)
+
+    with patch.dict(
+        "iambic.plugins.v0_1_0.github.github._LOCAL_REPO_PATH_CACHE", clear=True
+    ):
+        prepare_local_repo_for_new_commits(repo_url, str(first_path), "detect")
+
+        with patch(
+            "iambic.plugins.v0_1_0.github.github.shutil.move",
+            side_effect=OSError("cross-device link"),
+        ):
+            second_repo = prepare_local_repo_for_new_commits(
+                repo_url, str(second_path), "import"
+            )
+
+    assert not first_path.exists()
+    assert second_repo.active_branch.name == "attempt/import"
+    assert (second_path / "README.md").read_text() == "first"
+
+
 @pytest.fixture
 def pull_request_context():
     return {
@@ -494,12 +576,12 @@ def test_run_handler():
         assert 2 == mock_Github.call_count
         mock_Github.assert_has_calls(
             calls=[
-                call("fake-token"),
-                call("GH_OVERRIDE_TOKEN"),
+                call("fake-token", **GITHUB_CLIENT_KWARGS),
+                call("GH_OVERRIDE_TOKEN", **GITHUB_CLIENT_KWARGS),
             ]
         )
         mock_Github.return_value.get_repo.assert_called_once_with(
-            "exampleorg/iambic-templates"
+            "exampleorg/iambic-templates", lazy=True
         )
         mock_Github.return_value.get_repo.return_value.get_pull.assert_called_once_with(
             4
@@ -529,9 +611,9 @@ def test_run_handler():
         }
         run_handler(arg)
         assert 1 == mock_Github.call_count
-        mock_Github.assert_called_once_with("fake-token")
+        mock_Github.assert_called_once_with("fake-token", **GITHUB_CLIENT_KWARGS)
         mock_Github.return_value.get_repo.assert_called_once_with(
-            "exampleorg/iambic-templates"
+            "exampleorg/iambic-templates", lazy=True
         )
         mock_Github.return_value.get_repo.return_value.get_pull.assert_called_once_with(
             4
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import base64
 import json
 from unittest.mock import patch
 
+import boto3
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from moto import mock_secretsmanager
 
 from iambic.plugins.v0_1_0.github.github_app import (
+    _get_github_client,
     _get_installation_token,
     calculate_signature,
+    get_app_bearer_token,
+    get_secret_string,
     run_handler,
     verify_signature,
 )
@@ -117,11 +125,62 @@ def test_verify_signature_exception(mock_github_webhook_secret):
         assert "Bad signature" in excinfo
 
 
+def test_verify_signature_with_bytes_payload(mock_github_webhook_secret):
+    signature = "b611249a28989845434bfbe56cc4ebe0dfeb89161203157f82f43dd97de7eaa9"
+    payload = b"fe11f072e13fd8deefe7d906e7d59a673f1d7a7d"
+    verify_signature(signature, payload)
+
+
+def test_verify_signature_with_malformed_signature(mock_github_webhook_secret):
+    payload = "fe11f072e13fd8deefe7d906e7d59a673f1d7a7d"
+    with pytest.raises(Exception, match="Bad signature"):
+        verify_signature("fake-signature", payload)
+
+
 def test_run_handler_with_bad_signature(mock_pull_request_webhook_lambda_event):
     with pytest.raises(Exception):
         run_handler(mock_pull_request_webhook_lambda_event, None)
 
 
+def test_run_handler_ignores_unsupported_action(skip_signature_verification):
+    event = {
+        "headers": {
+            "x-github-event": "pull_request",
+            "x-github-hook-installation-target-id": "fake_app_id",
+            "x-hub-signature-256": "sha256=fake-signature",
+        },
+        "body": json.dumps(
+            {"action": "labeled", "installation": {"id": "fake-installation-id"}}
+        ),
+    }
+    with patch(
+        "iambic.plugins.v0_1_0.github.github_app._get_installation_token",
+    ) as mock_get_installation_token:
+        assert run_handler(event, None) is None
+        mock_get_installation_token.assert_not_called()
+
+
+def test_run_handler_with_base64_encoded_body(mock_github_webhook_secret):
+    body = json.dumps(
+        {"action": "labeled", "installation": {"id": "fake-installation-id"}}
+    )
+    event = {
+        "headers": {
+            "x-github-event": "pull_request",
+            "x-github-hook-installation-target-id": "fake_app_id",
+            "x-hub-signature-256": "sha256="
+            + calculate_signature(mock_github_webhook_secret, body),
+        },
+        "body": base64.b64encode(body.encode("utf-8")).decode("ascii"),
+        "isBase64Encoded": True,
+    }
+    with patch(
+        "iambic.plugins.v0_1_0.github.github_app._get_installation_token",
+    ) as mock_get_installation_token:
+        assert run_handler(event, None) is None
+        mock_get_installation_token.assert_not_called()
+
+
 def test_run_handler_with_unknown_event(
     skip_authentication, mock_github_cls, mock_unknown_webhook_lambda_event
 ):
@@ -168,17 +227,8 @@ def test_run_handler_with_unknown_event(
 
 class MockResponse:
     def __init__(self, text, status):
-        self._text = text
-        self.status = status
-
-    async def text(self):
-        return self._text
-
-    async def __aexit__(self, exc_type, exc, tb):
-        pass
-
-    async def __aenter__(self):
-        return self
+        self.content = text.encode("utf-8")
+        self.status_code = status
 
 
 @pytest.mark.asyncio
@@ -186,6 +236,86 @@ async def test_get_installation_token(skip_authentication):
     data = {"token": "fake_token"}
     resp = MockResponse(json.dumps(data), 200)
 
-    with patch("aiohttp.ClientSession.post", return_value=resp):
+    with patch(
+        "iambic.plugins.v0_1_0.github.github_app._GITHUB_API_SESSION.post",
+        return_value=resp,
+    ):
         token = await _get_installation_token("fake_app_id", "fake_installation_id")
         assert token == "fake_token"
+
+
+@pytest.mark.asyncio
+async def test_get_installation_token_is_cached(skip_authentication):
+    data = {"token": "fake_token", "expires_at": "2099-01-01T00:00:00Z"}
+
+    with patch.dict(
+        "iambic.plugins.v0_1_0.github.github_app._INSTALLATION_TOKEN_CACHE", clear=True
+    ), patch(
+        "iambic.plugins.v0_1_0.github.github_app._GITHUB_API_SESSION.post",
+        return_value=MockResponse(json.dumps(data), 201),
+    ) as mock_post:
+        for _ in range(2):
+            token = await _get_installation_token("fake_app_id", "fake_installation_id")
+            assert token == "fake_token"
+        assert mock_post.call_count == 1
+
+
+def test_get_app_bearer_token_is_cached():
+    private_key = (
+        rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        .private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        .decode("utf-8")
+    )
+    with patch.dict(
+        "iambic.plugins.v0_1_0.github.github_app._APP_JWT_CACHE", clear=True
+    ), patch(
+        "iambic.plugins.v0_1_0.github.github_app.jwt.encode",
+        return_value="fake_jwt",
+    ) as mock_encode:
+        assert get_app_bearer_token(private_key, "fake_app_id") == "fake_jwt"
+        assert get_app_bearer_token(private_key, "fake_app_id") == "fake_jwt"
+        assert mock_encode.call_count == 1
+        # the parsed key is handed to jwt instead of the PEM string
+        assert isinstance(mock_encode.call_args[0][1], rsa.RSAPrivateKey)
+
+
+@pytest.fixture()
+def mock_secrets_manager():
+    with mock_secretsmanager():
+        client = boto3.client("secretsmanager", region_name="us-west-2")
+        client.create_secret(Name="fake-secret", SecretString="fake-value")
+        with patch.dict(
+            "iambic.plugins.v0_1_0.github.github_app._SECRETS_MANAGER_CLIENTS",
+            clear=True,
+        ), patch.dict(
+            "iambic.plugins.v0_1_0.github.github_app._SECRET_STRING_CACHE", clear=True
+        ):
+            yield client
+
+
+def test_get_secret_string_is_cached(mock_secrets_manager):
+    assert get_secret_string("fake-secret", "us-west-2") == "fake-value"
+    mock_secrets_manager.put_secret_value(
+        SecretId="fake-secret", SecretString="new-value"
+    )
+    # served from the cache until the ttl expires
+    assert get_secret_string("fake-secret", "us-west-2") == "fake-value"
+
+
+def test_get_github_client_is_cached_per_token(mock_github_cls):
+    with patch.dict(
+        "iambic.plugins.v0_1_0.github.github_app._GITHUB_CLIENT_CACHE", clear=True
+    ):
+        client = _get_github_client("fake_app_id", "fake_installation_id", "token1")
+        assert client is _get_github_client(
+            "fake_app_id", "fake_installation_id", "token1"
+        )
+        assert mock_github_cls.call_count == 1
+
+        # a rotated token gets a new client
+        _get_github_client("fake_app_id", "fake_installation_id", "token2")
+        assert mock_github_cls.call_count == 2
@@ -4,6 +4,7 @@ import asyncio
 from test.plugins.v0_1_0.okta.test_utils import (  # noqa: F401 # intentional for mocks
     mock_okta_organization,
 )
+from unittest.mock import patch
 
 import okta.models
 import pytest
@@ -159,6 +160,29 @@ async def test_list_all_apps(
     assert apps[0].name == okta_app.name
 
 
+@pytest.mark.asyncio
+async def test_list_all_apps_fetches_each_assigned_user_once(
+    mock_application: tuple[OktaOrganization, Group, None, App]
+):
+    okta_organization, _, okta_app, okta_user = mock_application
+    client = await okta_organization.get_okta_client()
+    other_app_model = okta.models.Application()
+    other_app_model.name = "other_example_application"
+    other_app_model, _, _ = await client.create_application(other_app_model)
+    other_app = await get_app(okta_organization, str(other_app_model.id))
+
+    new_assignments = [Assignment(user=okta_user.username)]
+    for app in (okta_app, other_app):
+        await update_app_assignments(app, new_assignments, okta_organization, {})
+
+    with patch.object(client, "get_user", wraps=client.get_user) as mock_get_user:
+        apps = await list_all_apps(okta_organization)
+    assert len(apps) == 2
+    for app in apps:
+        assert [a.user for a in app.assignments] == [okta_user.username]
+    assert mock_get_user.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_update_app_name(
     mock_application: tuple[OktaOrganization, Group, None, App]
@@ -187,3 +211,27 @@ async def test_maybe_delete_app(
         {},
     )
     assert proposed_changes[0].change_type == ProposedChangeType.DELETE
+
+
+@pytest.mark.asyncio
+async def test_update_app_assignments_with_user_and_group(
+    mock_application: tuple[OktaOrganization, Group, None, App]
+):
+    okta_organization, okta_group, okta_app, okta_user = mock_application
+
+    new_assignments = [
+        Assignment(user=okta_user.username),
+        Assignment(group=okta_group.name),
+    ]
+    proposed_changes = await update_app_assignments(
+        okta_app,
+        new_assignments,
+        okta_organization,
+        {},
+    )
+    assert len(proposed_changes) == 1
+
+    okta_app = await get_app(okta_organization, str(okta_app.id))
+    assert sorted([(a.user, a.group) for a in okta_app.assignments], key=str) == sorted(
+        [(okta_user.username, None), (None, okta_group.name)], key=str
+    )
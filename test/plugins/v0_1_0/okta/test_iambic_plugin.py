@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
 from iambic.plugins.v0_1_0.okta.iambic_plugin import OktaConfig, OktaOrganization
@@ -33,3 +35,35 @@ def test_okta_config_with_repeated_idp_name():
         ValueError, match="idp_name must be unique within organizations: example.org"
     ):
         _ = OktaConfig(organizations=[okta_org_1, okta_org_2])
+
+
+def test_get_okta_client_reuses_pooled_session_per_event_loop():
+    okta_org = OktaOrganization(
+        idp_name="example.org",
+        org_url="https://example.okta.com/",
+        api_token="fake-token",
+    )
+
+    async def get_client_and_session():
+        client = await okta_org.get_okta_client()
+        assert client is await okta_org.get_okta_client()
+        session = client.get_request_executor()._http_client._session
+        assert session is not None
+        return client, session
+
+    loop = asyncio.new_event_loop()
+    try:
+        client_1, session_1 = loop.run_until_complete(get_client_and_session())
+        loop.run_until_complete(okta_org.close())
+        assert session_1.closed
+        assert okta_org.client is None
+    finally:
+        loop.close()
+
+    async def get_and_close_client():
+        client, session = await get_client_and_session()
+        await okta_org.close()
+        assert session.closed
+        return client
+
+    assert asyncio.run(get_and_close_client()) is not client_1
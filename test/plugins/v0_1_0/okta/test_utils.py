@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import time
 from collections import defaultdict, namedtuple
 from test.plugins.v0_1_0.okta.fake_okta_client import FakeOktaClient
 
@@ -12,7 +13,11 @@ from iambic.core.context import ctx
 from iambic.core.exceptions import RateLimitException
 from iambic.plugins.v0_1_0.okta.exceptions import UserProfileNotUpdatableYet
 from iambic.plugins.v0_1_0.okta.iambic_plugin import OktaOrganization
-from iambic.plugins.v0_1_0.okta.utils import generate_user_profile, handle_okta_fn
+from iambic.plugins.v0_1_0.okta.utils import (
+    OKTA_RATE_LIMIT_STORAGE,
+    generate_user_profile,
+    handle_okta_fn,
+)
 
 
 @pytest.fixture
@@ -113,3 +118,60 @@ async def test_handle_okta_fn_generic_json_error():
     kwargs = {"keyword_1": "keyword_1"}
     with pytest.raises(RateLimitException, match=json_error_string):
         await handle_okta_fn(sample_fn, *args, **kwargs)
+
+
+class FakeOktaResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+    def get_headers(self):
+        return self.headers
+
+
+class RateLimitedOktaClient:
+    def __init__(self, base_url, reset):
+        self.base_url = base_url
+        self.reset = reset
+
+    def get_base_url(self):
+        return self.base_url
+
+    async def list_things(self):
+        return (
+            [],
+            FakeOktaResponse(
+                {"X-Rate-Limit-Remaining": "1", "X-Rate-Limit-Reset": str(self.reset)}
+            ),
+            None,
+        )
+
+
+@pytest.mark.asyncio
+async def test_handle_okta_fn_waits_for_rate_limit_reset(monkeypatch):
+    sleep_calls = []
+
+    async def fake_sleep(seconds):
+        sleep_calls.append(seconds)
+
+    monkeypatch.setattr("asyncio.sleep", fake_sleep)
+    reset = time.time() + 30
+    client = RateLimitedOktaClient("https://example.okta.com", reset)
+    other_client = RateLimitedOktaClient("https://other.okta.com", reset)
+    key = ("https://example.okta.com", "list_things")
+    other_key = ("https://other.okta.com", "list_things")
+
+    try:
+        await handle_okta_fn(client.list_things)
+        assert OKTA_RATE_LIMIT_STORAGE[key] == (1, reset)
+        assert sleep_calls == []
+
+        # The limit of one org does not hold back requests to another
+        await handle_okta_fn(other_client.list_things)
+        assert sleep_calls == []
+
+        await handle_okta_fn(client.list_things)
+        assert len(sleep_calls) == 1
+        assert 0 < sleep_calls[0] <= 30
+    finally:
+        OKTA_RATE_LIMIT_STORAGE.pop(key, None)
+        OKTA_RATE_LIMIT_STORAGE.pop(other_key, None)
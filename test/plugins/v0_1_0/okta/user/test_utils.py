@@ -114,6 +114,26 @@ async def test_change_user_status(
     assert input_user.status == okta.models.UserStatus.ACTIVE
 
 
+@pytest.mark.asyncio
+async def test_change_user_status_when_status_is_unchanged(
+    mock_okta_organization: OktaOrganization,  # noqa: F811 # intentional for mocks
+):
+    input_user = iambic.plugins.v0_1_0.okta.models.User(
+        idp_name="example.org",
+        username="example_username",
+        user_id="example_user_id",
+        status="active",
+        profile={},
+    )
+    # Okta's upper case status must still match iambic's lower case status
+    proposed_changes = await change_user_status(
+        input_user,
+        okta.models.UserStatus.ACTIVE,
+        mock_okta_organization,
+    )
+    assert proposed_changes == []
+
+
 @pytest.mark.asyncio
 async def test_update_user_profile(
     mock_okta_organization: OktaOrganization,  # noqa: F811 # intentional for mocks
@@ -217,6 +237,57 @@ class TestUpdateUserStatus:
             "proposed_status": transition[1].value,
         }
 
+    @pytest.mark.asyncio
+    async def test_update_user_status_with_okta_status(
+        self,
+        mock_okta_organization: OktaOrganization,  # noqa: F811 # intentional for mocks
+        mock_ctx,
+    ):
+        okta_user = iambic.plugins.v0_1_0.okta.models.User(
+            idp_name="example.org",
+            username="example_username",
+            user_id="example_user_id",
+            status=UserStatus.provisioned.value,
+            profile={},
+        )
+
+        mock_ctx(eval_only=True)
+        proposed_changes = await update_user_status(
+            okta_user,
+            okta.models.UserStatus.ACTIVE,
+            mock_okta_organization,
+            {},
+        )
+
+        assert proposed_changes[0].change_summary == {
+            "current_status": UserStatus.provisioned.value,
+            "proposed_status": UserStatus.active.value,
+        }
+        assert proposed_changes[0].new_value == UserStatus.active.value
+
+    @pytest.mark.asyncio
+    async def test_update_user_status_with_invalid_transition(
+        self,
+        mock_okta_organization: OktaOrganization,  # noqa: F811 # intentional for mocks
+        mock_ctx,
+    ):
+        okta_user = iambic.plugins.v0_1_0.okta.models.User(
+            idp_name="example.org",
+            username="example_username",
+            user_id="example_user_id",
+            status=UserStatus.suspended.value,
+            profile={},
+        )
+
+        mock_ctx(eval_only=True)
+        with pytest.raises(Exception, match="Invalid transition from suspended"):
+            await update_user_status(
+                okta_user,
+                UserStatus.locked_out.value,
+                mock_okta_organization,
+                {},
+            )
+
     @pytest.mark.asyncio
     async def test_update_user_status_when_deleted(
         self,